@@ -1,7 +1,9 @@
 from .aiohttp_apispec import AiohttpApiSpec, setup_aiohttp_apispec
+from .async_validation import async_validates, async_validates_schema
 from .decorators import (
     cookies_schema,
     docs,
+    files_schema,
     form_schema,
     headers_schema,
     json_schema,
@@ -11,8 +13,15 @@ from .decorators import (
     request_schema,
     response_schema,
     use_kwargs,
+    ws_message_schema,
 )
+from .discriminator import DiscriminatorSchema
+from .errors import ValidationErrorResponse
+from .examples import generate_example
 from .middlewares import validation_middleware
+from .parsers import NativeParser
+from .policy import ValidationPolicy
+from .websocket import ws_messages
 
 __all__ = [
     # setup
@@ -24,12 +33,24 @@ __all__ = [
     "match_info_schema",
     "querystring_schema",
     "form_schema",
+    "files_schema",
     "json_schema",
     "headers_schema",
     "cookies_schema",
     "response_schema",
     "use_kwargs",
     "marshal_with",
+    "ws_message_schema",
+    "async_validates",
+    "async_validates_schema",
     # middleware
     "validation_middleware",
+    "NativeParser",
+    "ValidationErrorResponse",
+    "ValidationPolicy",
+    "DiscriminatorSchema",
+    # examples
+    "generate_example",
+    # websocket
+    "ws_messages",
 ]
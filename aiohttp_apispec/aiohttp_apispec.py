@@ -9,11 +9,24 @@ from aiohttp import web
 from aiohttp.hdrs import METH_ALL, METH_ANY
 from apispec import APISpec
 from apispec.core import VALID_METHODS_OPENAPI_V2
-from apispec.ext.marshmallow import MarshmallowPlugin, common
+from apispec.ext.marshmallow import common
 from jinja2 import Template
-from webargs.aiohttpparser import parser
-
-from .utils import get_path, get_path_keys, issubclass_py37fix
+from webargs.aiohttpparser import AIOHTTPParser, parser
+
+from .cache import SpecCache, fingerprint
+from .converter import SchemaPlugin
+from .discriminator import DiscriminatorSchema
+from .downgrade import to_swagger2
+from .errors import ValidationErrorResponse
+from .examples import generate_example
+from .names import COMPONENT_LOCATIONS, SchemaNameIndex
+from .parallel import build_parallel
+from .parsers import NativeParser, query_list_keys
+from .policy import ValidationPolicy
+from .profiling import SpecProfiler
+from .streaming import SpecStream
+from .utils import RoutePath, get_path_keys, get_route_path, issubclass_py37fix
+from .validation_cache import ValidationCache
 
 _AiohttpView = Callable[[web.Request], Awaitable[web.StreamResponse]]
 
@@ -24,6 +37,9 @@ DEFAULT_RESPONSE_LOCATION = "json"
 NAME_SWAGGER_SPEC = "swagger.spec"
 NAME_SWAGGER_DOCS = "swagger.docs"
 NAME_SWAGGER_STATIC = "swagger.static"
+NAME_SWAGGER_PROFILE = "swagger.profile"
+NAME_SWAGGER2_SPEC = "swagger.spec2"
+NAME_SWAGGER_EXAMPLES = "swagger.examples"
 
 INDEX_PAGE = "index.html"
 
@@ -59,8 +75,29 @@ class AiohttpApiSpec:
         prefix='',
         schema_name_resolver=resolver,
         openapi_version=None,
+        native_parser=False,
+        profile=False,
+        profile_path=None,
+        error_response=None,
+        cache_dir=None,
+        stream_spec=False,
+        validate_docs=False,
+        release_docs=False,
+        build_workers=None,
+        swagger2_url=None,
+        validation_cache_size=None,
+        generate_examples=False,
+        examples_url=None,
+        validation_policy=None,
+        max_form_field_size=2**20,
         **kwargs,
     ):
+        if error_callback is not None and error_response is not None:
+            raise ValueError(
+                "`error_callback` and `error_response` can not be used together"
+            )
+        if error_response is True:
+            error_response = ValidationErrorResponse()
         openapi_version = openapi_version or OpenApiVersion.V20
         try:
             openapi_version = OpenApiVersion(openapi_version)
@@ -68,8 +105,11 @@ class AiohttpApiSpec:
             raise ValueError(
                 f"Invalid `openapi_version`: {openapi_version!r}"
             ) from None
+        if swagger2_url is not None and openapi_version == OpenApiVersion.V20:
+            raise ValueError("`swagger2_url` requires OpenAPI 3 `openapi_version`")
 
-        self.plugin = MarshmallowPlugin(schema_name_resolver=schema_name_resolver)
+        self.names = SchemaNameIndex(schema_name_resolver)
+        self.plugin = SchemaPlugin(schema_name_resolver=self.names)
         self.spec = APISpec(
             plugins=(self.plugin,),
             openapi_version=openapi_version.value,
@@ -82,15 +122,79 @@ class AiohttpApiSpec:
         self._registered = False
         self._request_data_name = request_data_name
         self.error_callback = error_callback
+        self.error_response = error_response
+        self.native_parser = native_parser
         self.prefix = prefix
+        self.profile_path = profile_path
+        self.stream_spec = stream_spec
+        self.validate_docs = validate_docs
+        self.release_docs = release_docs
+        self.build_workers = build_workers
+        self.swagger2_url = swagger2_url
+        self._swagger2_spec = None
+        self.generate_examples = generate_examples
+        self.examples_url = examples_url
+        self._examples = None
+        self.validation_policy = validation_policy
+        self.max_form_field_size = max_form_field_size
+        self.validation_cache = (
+            ValidationCache(validation_cache_size)
+            if validation_cache_size is not None
+            else None
+        )
+        self._cache = SpecCache(cache_dir) if cache_dir is not None else None
+        self._cached_spec = None
+        self._profiler = SpecProfiler(enabled=profile or profile_path is not None)
         self._index_page = None
         if app is not None:
             self.register(app, in_place)
 
     def swagger_dict(self):
         """Returns swagger spec representation in JSON format"""
+        if self._cached_spec is not None:
+            return self._cached_spec
         return self.spec.to_dict()
 
+    def swagger2_dict(self):
+        """
+        Returns Swagger 2.0 spec converted from OpenAPI 3 one,
+        it is converted once after routes are registered
+        """
+        if self._swagger2_spec is None:
+            self._swagger2_spec = to_swagger2(self.swagger_dict())
+        return self._swagger2_spec
+
+    def examples_dict(self):
+        """
+        Returns examples of schema components by their names,
+        collected once from spec after routes are registered
+        """
+        if self._examples is None:
+            spec = self.swagger_dict()
+            components = spec.get("definitions") or spec.get("components", {}).get(
+                "schemas", {}
+            )
+            self._examples = {
+                name: component["example"]
+                for name, component in components.items()
+                if "example" in component
+            }
+        return self._examples
+
+    def profile_report(self, limit=None):
+        """
+        Returns time spent on building spec per route, stage and schema
+        and sizes of emitted schema components, largest values first.
+        Available only if AiohttpApiSpec was created with ``profile=True``
+        """
+        if not self._profiler.enabled:
+            raise RuntimeError("Profiling is disabled, pass `profile=True` to enable")
+        spec = self.swagger_dict()
+        components = spec.get("definitions") or spec.get("components", {}).get(
+            "schemas"
+        )
+        return self._profiler.report(components=components, limit=limit)
+
     def register(self, app: web.Application, in_place: bool = False):
         """Creates spec based on registered app routes and registers needed view"""
         if self._registered is True:
@@ -98,9 +202,12 @@ class AiohttpApiSpec:
 
         app["_apispec_request_data_name"] = self._request_data_name
 
-        if self.error_callback:
-            parser.error_callback = self.error_callback
-        app["_apispec_parser"] = parser
+        app["_apispec_parser"] = self._make_parser()
+        # compiled validators of docs-only views, filled by validation_middleware
+        app["_apispec_docs_validators"] = {} if self.validate_docs else None
+        app["_apispec_validation_cache"] = self.validation_cache
+        app["_apispec_validation_policy"] = self.validation_policy
+        app["_apispec_max_form_field_size"] = self.max_form_field_size
 
         if in_place:
             self._register(app)
@@ -116,6 +223,8 @@ class AiohttpApiSpec:
         if self.url is not None:
 
             async def swagger_handler(request):
+                if self.stream_spec:
+                    return await request.app["_apispec_spec_stream"].response(request)
                 return web.json_response(request.app["swagger_dict"])
 
             route_url = self.url
@@ -128,6 +237,55 @@ class AiohttpApiSpec:
             if self.swagger_path is not None:
                 self._add_swagger_web_page(app, self.static_path, self.swagger_path)
 
+        if self.swagger2_url is not None:
+
+            async def swagger2_handler(request):
+                return web.Response(
+                    body=request.app["_apispec_swagger2_body"],
+                    content_type="application/json",
+                )
+
+            app.router.add_route(
+                "GET", self.swagger2_url, swagger2_handler, name=NAME_SWAGGER2_SPEC
+            )
+
+        if self.examples_url is not None:
+
+            async def examples_handler(request):
+                return web.Response(
+                    body=request.app["_apispec_examples_body"],
+                    content_type="application/json",
+                )
+
+            app.router.add_route(
+                "GET", self.examples_url, examples_handler, name=NAME_SWAGGER_EXAMPLES
+            )
+
+        if self.profile_path is not None:
+
+            async def profile_handler(request):
+                limit = request.rel_url.query.get("limit") or None
+                if limit is not None:
+                    if not limit.isdecimal():
+                        raise web.HTTPBadRequest(
+                            text="`limit` must be a non-negative integer"
+                        )
+                    limit = int(limit)
+                return web.json_response(self.profile_report(limit))
+
+            app.router.add_route(
+                "GET", self.profile_path, profile_handler, name=NAME_SWAGGER_PROFILE
+            )
+
+    def _make_parser(self):
+        error_handler = self.error_response or self.error_callback
+        if self.native_parser:
+            return NativeParser(error_handler=error_handler)
+        if error_handler:
+            # do not touch module level webargs parser used by other apps
+            return AIOHTTPParser(error_handler=error_handler)
+        return parser
+
     def _get_index_page(self, app, static_files, static_path):
         if self._index_page is not None:
             return self._index_page
@@ -167,18 +325,109 @@ class AiohttpApiSpec:
         app.router.add_route("GET", view_path, swagger_view, name=NAME_SWAGGER_DOCS)
 
     def _register(self, app: web.Application):
+        routes = list(self._iter_routes(app))
+        key = None
+        if self._cache is not None:
+            key = self._fingerprint(routes)
+            self._cached_spec = self._cache.load(key)
+        if self._cached_spec is None:
+            self.names.index(self._iter_view_schemas(routes))
+            if not self._build_parallel(routes):
+                for route, method, view in routes:
+                    self._register_route(route, method, view)
+            if self.generate_examples:
+                self._embed_examples()
+            if self._cache is not None:
+                self._cache.store(key, self.spec.to_dict())
+        app["swagger_dict"] = self.swagger_dict()
+        if self.swagger2_url is not None:
+            app["_apispec_swagger2_body"] = json.dumps(self.swagger2_dict()).encode()
+        if self.examples_url is not None:
+            app["_apispec_examples_body"] = json.dumps(self.examples_dict()).encode()
+        if self.release_docs:
+            for _, _, view in routes:
+                self._release_docs(view)
+        if self.stream_spec:
+            app["_apispec_spec_stream"] = SpecStream(app["swagger_dict"])
+
+    def _embed_examples(self):
+        """Adds generated examples to schema components without example"""
+        memo = {}
+        components = self.spec.components.schemas
+        for name, schema in self.names.schemas.items():
+            if name in components and "example" not in components[name]:
+                with self._profiler.measure("generate_example", schema):
+                    components[name]["example"] = generate_example(schema, memo)
+
+    @staticmethod
+    def _iter_view_schemas(routes):
+        """Yields (schema, is_component) pairs of documented views"""
+        for _, method, view in routes:
+            if method not in VALID_METHODS_OPENAPI_V2:
+                continue
+            data = getattr(view, "__apispec__", {})
+            for record in data.get("schemas", ()):
+                if isinstance(record.schema, DiscriminatorSchema):
+                    for schema in record.schema.mapping.values():
+                        yield schema, True
+                else:
+                    yield record.schema, record.location in COMPONENT_LOCATIONS
+            for response in data.get("responses", {}).values():
+                if "schema" in response:
+                    yield response["schema"], True
+            ws_messages = data.get("ws_messages")
+            if isinstance(ws_messages, DiscriminatorSchema):
+                for schema in ws_messages.mapping.values():
+                    yield schema, True
+            elif ws_messages is not None:
+                yield ws_messages, True
+
+    def _build_parallel(self, routes):
+        # per route profiling is collected in this process only
+        if not self.build_workers or self.build_workers < 2 or self._profiler.enabled:
+            return False
+        if len(routes) < self.build_workers:
+            return False
+        return build_parallel(self, routes, self.build_workers)
+
+    def _release_docs(self, view):
+        """Drops decorators data not needed by validation_middleware"""
+        if not hasattr(view, "__apispec__"):
+            return
+        keep = ("parameters", "requestBody") if self.validate_docs else ()
+        view.__apispec__ = {
+            key: value for key, value in view.__apispec__.items() if key in keep
+        }
+        if hasattr(view, "__schemas__"):
+            view.__schemas__ = [
+                record._replace(example=None) for record in view.__schemas__
+            ]
+
+    @staticmethod
+    def _iter_routes(app: web.Application):
         for route in app.router.routes():
             if issubclass_py37fix(route.handler, web.View) and route.method == METH_ANY:
                 for attr in dir(route.handler):
                     if attr.upper() in METH_ALL:
-                        view = getattr(route.handler, attr)
-                        method = attr
-                        self._register_route(route, method, view)
+                        yield route, attr, getattr(route.handler, attr)
             else:
-                method = route.method.lower()
-                view = route.handler
-                self._register_route(route, method, view)
-        app["swagger_dict"] = self.swagger_dict()
+                yield route, route.method.lower(), route.handler
+
+    def _fingerprint(self, routes):
+        entries = []
+        for route, method, view in routes:
+            route_path = get_route_path(route)
+            if route_path is not None:
+                entries.append((method, route_path.template, view))
+        options = {
+            "spec": self.spec.to_dict(),
+            "prefix": self.prefix,
+            "schema_name_resolver": self.names.resolver,
+            "generate_examples": self.generate_examples,
+            # list query parameters are documented by parser
+            "native_parser": self.native_parser,
+        }
+        return fingerprint(entries, options)
 
     def _register_route(
         self, route: web.AbstractRoute, method: str, view: _AiohttpView
@@ -187,38 +436,73 @@ class AiohttpApiSpec:
         if not hasattr(view, "__apispec__"):
             return None
 
-        url_path = get_path(route)
-        if not url_path:
+        route_path = get_route_path(route)
+        if route_path is None:
             return None
 
-        self._update_paths(view.__apispec__, method, self.prefix + url_path)
+        url_path = self.prefix + route_path.template
+        with self._profiler.route(method, url_path):
+            self._update_paths(view.__apispec__, method, url_path, route_path)
 
-    def _update_paths(self, data: dict, method: str, url_path: str):
+    def _update_paths(
+        self,
+        data: dict,
+        method: str,
+        url_path: str,
+        route_path: RoutePath = None,
+    ):
         if method not in VALID_METHODS_OPENAPI_V2:
             return None
-        for schema in data.pop("schemas", []):
-            parameters = self.plugin.converter.schema2parameters(
-                schema["schema"], location=schema["location"], **schema["options"]
-            )
-            self._add_examples(schema["schema"], parameters, schema["example"])
-            data["parameters"].extend(parameters)
-
-        existing = [p["name"] for p in data["parameters"] if p["in"] == "path"]
-        data["parameters"].extend(
-            {"in": "path", "name": path_key, "required": True, "type": "string"}
-            for path_key in get_path_keys(url_path)
-            if path_key not in existing
-        )
+        profiler = self._profiler
+        # decorators data is kept as is, operation is built from its copy
+        operation = {
+            key: value
+            for key, value in data.items()
+            if key not in ("schemas", "ws_messages")
+        }
+        operation["parameters"] = parameters = list(data.get("parameters", []))
+        for record in data.get("schemas", []):
+            if isinstance(record.schema, DiscriminatorSchema):
+                parameters.append(self._discriminator_parameter(record))
+                continue
+            with profiler.measure("schema2parameters", record.schema):
+                schema_parameters = self.plugin.converter.schema2parameters(
+                    record.schema, location=record.location, required=record.required
+                )
+            if self.native_parser and record.location in ("query", "querystring"):
+                self._set_delimited_style(record.schema, schema_parameters)
+            with profiler.measure("add_examples"):
+                self._add_examples(
+                    record.schema, schema_parameters, record.example, record.add_to_refs
+                )
+            parameters.extend(schema_parameters)
+
+        existing = [p["name"] for p in parameters if p["in"] == "path"]
+        if route_path is None:
+            route_path = RoutePath(url_path, tuple(get_path_keys(url_path)), {})
+        for path_key in route_path.keys:
+            if path_key in existing:
+                continue
+            schema = {"type": "string"}
+            if path_key in route_path.patterns:
+                schema["pattern"] = route_path.patterns[path_key]
+            parameter = {"in": "path", "name": path_key, "required": True}
+            if self.spec.components.openapi_version.major < 3:
+                parameter.update(schema)
+            else:
+                parameter["schema"] = schema
+            parameters.append(parameter)
 
         if "responses" in data:
             responses = {}
             for code, actual_params in data["responses"].items():
                 if "schema" in actual_params:
-                    raw_parameters = self.plugin.converter.schema2parameters(
-                        actual_params["schema"],
-                        location=DEFAULT_RESPONSE_LOCATION,
-                        required=actual_params.get("required", False),
-                    )[0]
+                    with profiler.measure("schema2parameters", actual_params["schema"]):
+                        raw_parameters = self.plugin.converter.schema2parameters(
+                            actual_params["schema"],
+                            location=DEFAULT_RESPONSE_LOCATION,
+                            required=actual_params.get("required", False),
+                        )[0]
                     updated_params = {
                         k: v
                         for k, v in raw_parameters.items()
@@ -238,12 +522,69 @@ class AiohttpApiSpec:
                     responses[code] = updated_params
                 else:
                     responses[code] = actual_params
-            data["responses"] = responses
+            operation["responses"] = responses
+
+        if "ws_messages" in data:
+            operation["x-websocket-messages"] = self._resolve_schema(
+                data["ws_messages"]
+            )
 
-        operations = copy.deepcopy(data)
-        self.spec.path(path=url_path, operations={method: operations})
+        with profiler.measure("deepcopy"):
+            operations = copy.deepcopy(operation)
+        with profiler.measure("spec.path"):
+            self.spec.path(path=url_path, operations={method: operations})
+
+    def _discriminator_parameter(self, record):
+        with self._profiler.measure("schema2parameters", record.schema):
+            schema = self._resolve_schema(record.schema)
+        if record.example:
+            schema["example"] = record.example
+        return {
+            "in": "body",
+            "required": record.required,
+            "name": "body",
+            "schema": schema,
+        }
+
+    def _resolve_schema(self, schema):
+        """
+        Returns schema dict (``$ref`` for named schemas), discriminated schemas
+        are documented with ``oneOf`` and ``discriminator`` (``x-oneOf`` and
+        ``x-discriminator`` extensions in OpenAPI 2)
+        """
+        resolve = self.plugin.converter.resolve_nested_schema
+        if not isinstance(schema, DiscriminatorSchema):
+            return resolve(schema)
+        one_of = []
+        mapping = {}
+        for value, item in schema.mapping.items():
+            schema_dict = resolve(item)
+            if schema_dict not in one_of:
+                one_of.append(schema_dict)
+            if "$ref" in schema_dict:
+                mapping[str(value)] = schema_dict["$ref"]
+        discriminator = {"propertyName": schema.discriminator}
+        if mapping:
+            discriminator["mapping"] = mapping
+        if self.spec.components.openapi_version.major < 3:
+            return {"x-oneOf": one_of, "x-discriminator": discriminator}
+        return {"oneOf": one_of, "discriminator": discriminator}
+
+    def _set_delimited_style(self, schema, parameters):
+        """
+        Documents list query parameters with comma separated values,
+        split by :class:`NativeParser` only
+        """
+        _, delimited_keys = query_list_keys(schema)
+        for parameter in parameters:
+            if parameter["name"] not in delimited_keys:
+                continue
+            if self.spec.components.openapi_version.major < 3:
+                parameter["collectionFormat"] = "csv"
+            else:
+                parameter["explode"] = False
 
-    def _add_examples(self, ref_schema, endpoint_schema, example):
+    def _add_examples(self, ref_schema, endpoint_schema, example, add_to_refs):
         def add_to_endpoint_or_ref():
             if add_to_refs:
                 self.spec.components.schemas[name]["example"] = example
@@ -257,7 +598,6 @@ class AiohttpApiSpec:
             return
         schema_instance = common.resolve_schema_instance(ref_schema)
         name = self.plugin.converter.schema_name_resolver(schema_instance)
-        add_to_refs = example.pop('add_to_refs')
         if self.spec.components.openapi_version.major < 3:
             if name and name in self.spec.components.schemas:
                 add_to_endpoint_or_ref()
@@ -279,6 +619,21 @@ def setup_aiohttp_apispec(
     prefix: str = '',
     schema_name_resolver: Callable = resolver,
     openapi_version: Union[str, OpenApiVersion] = OpenApiVersion.V20,
+    native_parser: bool = False,
+    profile: bool = False,
+    profile_path: str = None,
+    error_response: Union[bool, ValidationErrorResponse] = None,
+    cache_dir: str = None,
+    stream_spec: bool = False,
+    validate_docs: bool = False,
+    release_docs: bool = False,
+    build_workers: int = None,
+    swagger2_url: str = None,
+    validation_cache_size: int = None,
+    generate_examples: bool = False,
+    examples_url: str = None,
+    validation_policy: ValidationPolicy = None,
+    max_form_field_size: int = 2**20,
     **kwargs,
 ) -> AiohttpApiSpec:
     """
@@ -330,13 +685,71 @@ def setup_aiohttp_apispec(
                              By default it is None (disabled)
     :param str static_path: path for static files used by SwaggerUI
                             (if it is enabled with ``swagger_path``)
-    :param error_callback: custom error handler
+    :param error_callback: custom error handler, used only by parser of this app
     :param in_place: register all routes at the moment of calling this function
                      instead of the moment of the on_startup signal.
                      If True, be sure all routes are added to router
     :param prefix: prefix to add to all registered routes
     :param schema_name_resolver: custom schema_name_resolver for MarshmallowPlugin.
+                                 Schemas it returns None for are inlined,
+                                 except recursive ones, which are added to
+                                 components with names of their classes
     :param openapi_version: version of OpenAPI schema
+    :param native_parser: use :class:`NativeParser` in validation_middleware
+                          instead of webargs parser. It loads request data
+                          straight from aiohttp request with the same
+                          error handling
+    :param profile: collect time spent on building spec per route and schema,
+                    see :meth:`AiohttpApiSpec.profile_report`
+    :param profile_path: url of debug endpoint with profiling report.
+                         Enables profiling. By default it is None (disabled)
+    :param error_response: :class:`ValidationErrorResponse` instance (or True
+                           for default one) to return validation errors
+                           straight from validation_middleware.
+                           Can not be used with ``error_callback``
+    :param cache_dir: directory to cache built spec in. Spec is built again
+                      only if fingerprint of routes (paths, methods, handlers,
+                      decorators data and schemas) changes
+    :param stream_spec: serve spec with chunked response encoded path by path
+                        and schema by schema instead of encoding
+                        the whole document for every request
+    :param validate_docs: validate requests to views without request schemas
+                          against raw ``parameters`` and ``requestBody``
+                          passed to ``docs`` (JSON schema subset: types,
+                          formats, enums, ranges, lengths, patterns, items
+                          and object properties). Validators are compiled
+                          once per view, errors are handled like schema ones
+    :param release_docs: drop documentation data (summaries, descriptions,
+                         examples, responses) from views once spec is built,
+                         keeping only what validation_middleware needs.
+                         Views can not be documented by another app after it
+    :param build_workers: number of forked processes to convert routes
+                          in parallel. Results are merged in route order;
+                          spec is built serially if fork is not available,
+                          profiling is enabled or different schemas are
+                          resolved to one name. By default spec is built serially
+    :param swagger2_url: url for Swagger 2.0 spec in JSON format, converted
+                         from OpenAPI 3 spec served on ``url`` instead of
+                         registering routes twice. Requires OpenAPI 3
+                         ``openapi_version``
+    :param validation_cache_size: max number of validated query string
+                                  and match info results of GET requests
+                                  to keep in LRU cache, so repeated requests
+                                  skip validation. Stats are available with
+                                  ``AiohttpApiSpec.validation_cache.stats()``.
+                                  By default it is None (disabled)
+    :param generate_examples: add examples generated from schemas (honoring
+                              validators and ``data_key``) to schema components
+                              without explicit example, once per component
+    :param examples_url: url for examples of schema components by their names
+                         in JSON format, collected once from spec
+    :param validation_policy: :class:`ValidationPolicy` to skip or sample
+                              validation of trusted requests, their views get
+                              minimal decode of request data. By default all
+                              requests are validated
+    :param max_form_field_size: max size in bytes of a text field of multipart
+                                requests streamed for ``files_schema``,
+                                None disables the limit. By default it is 1 MiB
     :param kwargs: any apispec.APISpec kwargs
     :return: return instance of AiohttpApiSpec class
     :rtype: AiohttpApiSpec
@@ -354,5 +767,20 @@ def setup_aiohttp_apispec(
         prefix=prefix,
         schema_name_resolver=schema_name_resolver,
         openapi_version=openapi_version,
+        native_parser=native_parser,
+        profile=profile,
+        profile_path=profile_path,
+        error_response=error_response,
+        cache_dir=cache_dir,
+        stream_spec=stream_spec,
+        validate_docs=validate_docs,
+        release_docs=release_docs,
+        build_workers=build_workers,
+        swagger2_url=swagger2_url,
+        validation_cache_size=validation_cache_size,
+        generate_examples=generate_examples,
+        examples_url=examples_url,
+        validation_policy=validation_policy,
+        max_form_field_size=max_form_field_size,
         **kwargs,
     )
@@ -0,0 +1,200 @@
+import asyncio
+from weakref import WeakKeyDictionary
+
+from marshmallow import ValidationError
+from marshmallow.error_store import merge_errors
+
+from .discriminator import DiscriminatorSchema
+
+SCHEMA = "_schema"
+
+_validators = WeakKeyDictionary()
+
+
+def async_validates(*field_names, batch=False):
+    """
+    Register async field validator of schema, run by validation_middleware
+    after schema is loaded.
+
+    Validator is called with loaded value of every field and ``request``
+    keyword argument and raises :class:`ValidationError <marshmallow.ValidationError>`.
+    With ``batch=True`` it is called once with list of values of all items
+    of ``many=True`` data (list of one value otherwise) and returns
+    ``{position: messages}`` of invalid values.
+
+    Usage:
+
+    .. code-block:: python
+
+        class OrderSchema(Schema):
+            product_id = fields.Int()
+
+            @async_validates("product_id", batch=True)
+            async def check_products(self, values, request):
+                found = await request.app["db"].find_products(values)
+                return {
+                    i: "Unknown product." for i, v in enumerate(values)
+                    if v not in found
+                }
+    """
+
+    def wrapper(func):
+        func.__async_validator__ = (field_names, batch)
+        return func
+
+    return wrapper
+
+
+def async_validates_schema(batch=False):
+    """
+    Register async schema level validator, see :func:`async_validates`.
+    Validator is called with loaded data (or list of all items
+    with ``batch=True``), errors are stored under ``_schema`` key.
+    """
+    return async_validates(batch=batch)
+
+
+def get_async_validators(schema):
+    """
+    Returns ``(method name, fields, batch)`` of schema instance, found once.
+    Fields are ``(error key, attribute)`` pairs, or empty for schema validators.
+    Unknown field names raise ValueError, fields excluded from the instance
+    (``only``, ``exclude``) are skipped like marshmallow does.
+    """
+    try:
+        return _validators[schema]
+    except KeyError:
+        pass
+    schema_cls = type(schema)
+    validators = []
+    for attr in dir(schema_cls):
+        marker = getattr(getattr(schema_cls, attr), "__async_validator__", None)
+        if marker is None:
+            continue
+        field_names, batch = marker
+        validator_fields = []
+        for field_name in field_names:
+            if field_name not in schema.declared_fields:
+                raise ValueError(
+                    '"{}" field of async validator {}.{} does not exist.'.format(
+                        field_name, schema_cls.__name__, attr
+                    )
+                )
+            field = schema.fields.get(field_name)
+            if field is not None:
+                validator_fields.append(
+                    (field.data_key or field_name, field.attribute or field_name)
+                )
+        if field_names and not validator_fields:
+            continue
+        validators.append((attr, tuple(validator_fields), batch))
+    _validators[schema] = validators = tuple(validators)
+    return validators
+
+
+def has_async_validators(schema) -> bool:
+    """
+    Returns True if schema (or any schema of discriminator mapping)
+    has async validators. Variants of discriminator schema with them
+    must load discriminator field, to be told by loaded data.
+    """
+    if not isinstance(schema, DiscriminatorSchema):
+        return bool(get_async_validators(schema))
+    found = False
+    for variant in schema.mapping.values():
+        if not get_async_validators(variant):
+            continue
+        if schema._loaded_keys[id(variant)] is None:
+            raise ValueError(
+                "{} has async validators but does not load "
+                '"{}" discriminator field.'.format(
+                    type(variant).__name__, schema.discriminator
+                )
+            )
+        found = True
+    return found
+
+
+async def run_async_validators(schema, data, request):
+    """
+    Runs async validators of schema for loaded data concurrently,
+    raises :class:`ValidationError <marshmallow.ValidationError>`
+    with messages keyed like marshmallow ones
+    """
+    many = isinstance(data, list)
+    items = data if many else [data]
+    checks = []
+    for variant, indexes in _group_items(schema, items):
+        for attr, validator_fields, batch in get_async_validators(variant):
+            method = getattr(variant, attr)
+            for key, attribute in validator_fields or ((SCHEMA, None),):
+                if attribute is None:
+                    positions = indexes
+                    values = [items[index] for index in positions]
+                else:
+                    positions = [
+                        index for index in indexes if attribute in items[index]
+                    ]
+                    values = [items[index][attribute] for index in positions]
+                if not values:
+                    continue
+                if batch:
+                    checks.append(_check_batch(method, key, positions, values, request))
+                else:
+                    checks.extend(
+                        _check(method, key, index, value, request)
+                        for index, value in zip(positions, values)
+                    )
+    errors = {}
+    for result in await asyncio.gather(*checks):
+        for index, key, messages in result:
+            item_errors = errors.setdefault(index, {})
+            item_errors[key] = merge_errors(item_errors.get(key), messages)
+    if errors:
+        raise ValidationError(dict(sorted(errors.items())) if many else errors[0])
+
+
+def _group_items(schema, items):
+    """Returns (schema, indexes of items) pairs, variants of discriminator schema"""
+    if not isinstance(schema, DiscriminatorSchema):
+        return [(schema, list(range(len(items))))]
+    groups = {}
+    for index, item in enumerate(items):
+        variant = schema.select_loaded(item)
+        if variant is not None:
+            groups.setdefault(id(variant), (variant, []))[1].append(index)
+    return list(groups.values())
+
+
+async def _check(method, key, index, value, request):
+    try:
+        await method(value, request=request)
+    except ValidationError as error:
+        return [(index, key, _as_list(error.messages))]
+    return []
+
+
+async def _check_batch(method, key, positions, values, request):
+    try:
+        invalid = await method(values, request=request)
+    except ValidationError as error:
+        return [(index, key, _as_list(error.messages)) for index in positions]
+    result = []
+    for position, messages in (invalid or {}).items():
+        if (
+            not isinstance(position, int)
+            or isinstance(position, bool)
+            or not 0 <= position < len(positions)
+        ):
+            raise ValueError(
+                "Async validator {} returned position {!r}, "
+                "expected index of {} values.".format(
+                    method.__qualname__, position, len(values)
+                )
+            )
+        result.append((positions[position], key, _as_list(messages)))
+    return result
+
+
+def _as_list(messages):
+    return messages if isinstance(messages, (list, dict)) else [messages]
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import tempfile
+import warnings
+from pathlib import Path
+
+import apispec
+from marshmallow import Schema, class_registry, fields, validate
+from marshmallow.exceptions import RegistryError
+
+from .discriminator import DiscriminatorSchema
+
+SCHEMA_MODIFIERS = ("only", "exclude", "load_only", "dump_only", "partial", "many")
+# Meta options of schema apispec and marshmallow read
+META_OPTIONS = (
+    "title",
+    "description",
+    "unknown",
+    "ordered",
+    "fields",
+    "exclude",
+    "load_only",
+    "dump_only",
+)
+# field attributes apispec converter and examples read, besides common ones
+FIELD_ATTRIBUTES = (
+    "many",
+    "only",
+    "exclude",
+    "field_name",
+    "precision",
+    "format",
+    "by_value",
+    "as_string",
+    "places",
+    "constant",
+)
+# fields of container fields
+INNER_FIELDS = ("inner", "key_field", "value_field")
+
+
+class SpecCache:
+    """
+    Stores built specs as JSON files named by route table fingerprint.
+
+    :param directory: directory for cache files, created if it does not exist
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def load(self, fingerprint):
+        """Returns cached spec dict or None"""
+        try:
+            with open(str(self._path(fingerprint)), encoding="utf-8") as fp:
+                return json.load(fp)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, fingerprint, spec):
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.directory), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as fp:
+                json.dump(spec, fp)
+            os.replace(tmp_path, str(self._path(fingerprint)))
+        except (OSError, TypeError, ValueError) as exc:
+            warnings.warn("Can not store spec cache: {}".format(exc))
+
+    def _path(self, fingerprint):
+        return self.directory / "{}.json".format(fingerprint)
+
+
+def fingerprint(entries, options):
+    """
+    Returns fingerprint of the route table.
+
+    :param entries: iterable of (method, path, view) tuples
+    :param options: anything else affecting spec (title, version etc.)
+    """
+    digest = hashlib.sha256()
+    memo = {}
+    digest.update(repr((apispec.__version__, _signature(options, memo))).encode())
+    for method, path, view in entries:
+        digest.update(
+            repr(
+                (
+                    method,
+                    path,
+                    _qualname(view),
+                    _signature(getattr(view, "__apispec__", None), memo),
+                )
+            ).encode()
+        )
+    return digest.hexdigest()
+
+
+def _qualname(obj):
+    return "{}.{}".format(
+        getattr(obj, "__module__", None), getattr(obj, "__qualname__", repr(obj))
+    )
+
+
+def _signature(value, memo):
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _signature(v, memo)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(repr(_signature(v, memo)) for v in value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_signature(v, memo) for v in value)
+    if isinstance(value, DiscriminatorSchema):
+        return value.discriminator, _signature(value.mapping, memo)
+    if isinstance(value, Schema) or (
+        isinstance(value, type) and issubclass(value, Schema)
+    ):
+        return _schema_signature(value, memo)
+    if isinstance(value, fields.Field):
+        return _field_signature(value, memo)
+    if callable(value):
+        return _qualname(value)
+    return repr(value)
+
+
+def _schema_signature(schema, memo):
+    schema_cls = schema if isinstance(schema, type) else type(schema)
+    modifiers = tuple(
+        repr(_signature(getattr(schema, modifier, None), memo))
+        for modifier in SCHEMA_MODIFIERS
+    )
+    key = (schema_cls, modifiers)
+    if key in memo:
+        # self references and already described schemas
+        return memo[key]
+    memo[key] = name = _qualname(schema_cls) + repr(modifiers)
+    meta = getattr(schema_cls, "Meta", None)
+    return (
+        name,
+        tuple(
+            (option, _signature(getattr(meta, option, None), memo))
+            for option in META_OPTIONS
+        ),
+        tuple(
+            (field_name, _field_signature(field, memo))
+            for field_name, field in schema_cls._declared_fields.items()
+        ),
+    )
+
+
+def _field_signature(field, memo):
+    nested = None
+    if isinstance(field, fields.Nested):
+        nested = _nested_signature(field.nested, memo)
+    enum = getattr(field, "enum", None)
+    return (
+        type(field).__qualname__,
+        field.data_key,
+        field.required,
+        field.allow_none,
+        field.load_only,
+        field.dump_only,
+        repr(getattr(field, "load_default", None)),
+        _signature(field.metadata, memo),
+        tuple(_validator_signature(validator) for validator in field.validators),
+        nested,
+        tuple(
+            _signature(getattr(field, attribute, None), memo)
+            for attribute in FIELD_ATTRIBUTES
+        ),
+        tuple(
+            (
+                _field_signature(getattr(field, attribute), memo)
+                if getattr(field, attribute, None) is not None
+                else None
+            )
+            for attribute in INNER_FIELDS
+        ),
+        tuple(
+            _field_signature(inner, memo)
+            for inner in getattr(field, "tuple_fields", ())
+        ),
+        (
+            tuple((member.name, repr(member.value)) for member in enum)
+            if enum is not None
+            else None
+        ),
+    )
+
+
+def _nested_signature(nested, memo):
+    if isinstance(nested, dict):
+        # schema generated from dict of fields
+        return _signature(nested, memo)
+    try:
+        if isinstance(nested, str):
+            nested = class_registry.get_class(nested)
+        elif callable(nested) and not isinstance(nested, type):
+            nested = nested()
+    except RegistryError:
+        # not registered yet, spec can not be built with it either
+        return repr(nested)
+    return _schema_signature(nested, memo)
+
+
+def _validator_signature(validator):
+    # marshmallow validators have repr with their arguments (min, choices etc.)
+    if isinstance(validator, validate.Validator):
+        return repr(validator)
+    return _qualname(validator)
@@ -0,0 +1,100 @@
+import copy
+
+import marshmallow
+from apispec.ext.marshmallow import MarshmallowPlugin, common
+from apispec.ext.marshmallow.openapi import OpenAPIConverter
+
+from .utils import iter_nested_fields
+
+BODY_LOCATIONS = ("json", "body")
+
+
+class SchemaConverter(OpenAPIConverter):
+    """
+    OpenAPI converter which converts every schema variant (schema class
+    with ``only``, ``exclude``, ``many`` etc.) once.
+
+    Inline schemas (``schema_name_resolver`` returned None) and parameters
+    of query string, headers etc. are memoized by schema key, and copies
+    of them are returned. Recursive schemas can not be inlined, so they are
+    added to components with names derived from their classes, once cycle
+    is found, and every occurrence of them is ``$ref``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._inline = {}
+        self._parameters = {}
+        self._recursive = {}
+
+    def resolve_nested_schema(self, schema):
+        try:
+            instance = common.resolve_schema_instance(schema)
+        except marshmallow.exceptions.RegistryError:
+            # unknown schema name is a reference itself
+            return schema
+        key = common.make_schema_key(instance)
+        if key in self.refs:
+            return self.get_ref_dict(instance)
+        if key not in self._inline:
+            name = self.schema_name_resolver(schema)
+            if not name and self._is_recursive(instance):
+                name = self._recursive_name(instance)
+            if name:
+                name = common.get_unique_schema_name(self.spec.components, name)
+                self.spec.components.schema(name, schema=schema)
+                return self.get_ref_dict(instance)
+            self._inline[key] = self.schema2jsonschema(instance)
+        json_schema = copy.deepcopy(self._inline[key])
+        # many is not a part of schema key
+        if getattr(schema, "many", False):
+            return {"type": "array", "items": json_schema}
+        return json_schema
+
+    def schema2parameters(self, schema, *, location, **kwargs):
+        if location in BODY_LOCATIONS:
+            return super().schema2parameters(schema, location=location, **kwargs)
+        # name, required and description are used for body parameter only
+        key = (common.make_schema_key(common.resolve_schema_instance(schema)), location)
+        try:
+            parameters = self._parameters[key]
+        except KeyError:
+            parameters = self._parameters[key] = super().schema2parameters(
+                schema, location=location, **kwargs
+            )
+        return copy.deepcopy(parameters)
+
+    def _is_recursive(self, schema):
+        key = common.make_schema_key(schema)
+        if key not in self._recursive:
+            self._recursive[key] = _reaches(schema, key, set())
+        return self._recursive[key]
+
+    def _recursive_name(self, schema):
+        name = type(schema).__name__
+        if name.endswith("Schema"):
+            name = name[:-6] or name
+        # keeps name index of AiohttpApiSpec consistent
+        reserve = getattr(self.schema_name_resolver, "reserve", None)
+        return reserve(schema, name) if reserve is not None else name
+
+
+class SchemaPlugin(MarshmallowPlugin):
+    """MarshmallowPlugin with :class:`SchemaConverter`"""
+
+    Converter = SchemaConverter
+
+
+def _reaches(schema, target, seen):
+    for field in schema.fields.values():
+        for nested in iter_nested_fields(field):
+            nested_schema = nested.schema
+            key = common.make_schema_key(nested_schema)
+            if key == target:
+                return True
+            if key in seen:
+                continue
+            seen.add(key)
+            if _reaches(nested_schema, target, seen):
+                return True
+    return False
@@ -1,6 +1,7 @@
 from .docs import docs
 from .request import (
     cookies_schema,
+    files_schema,
     form_schema,
     headers_schema,
     json_schema,
@@ -10,3 +11,4 @@ from .request import (
     use_kwargs,
 )
 from .response import marshal_with, response_schema
+from .websocket import ws_message_schema
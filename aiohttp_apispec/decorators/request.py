@@ -1,5 +1,14 @@
 import copy
+import keyword
 from functools import partial
+from typing import Any, NamedTuple, Optional
+
+from marshmallow import INCLUDE, Schema
+
+from ..async_validation import has_async_validators
+from ..discriminator import DiscriminatorSchema
+from ..pool import SchemaPool
+from ..utils import make_data_class
 
 # locations supported by both openapi and webargs.aiohttpparser
 VALID_SCHEMA_LOCATIONS = (
@@ -15,8 +24,32 @@ VALID_SCHEMA_LOCATIONS = (
 )
 
 
+class SchemaRecord(NamedTuple):
+    """
+    Request schema of a view, shared by ``__apispec__["schemas"]``
+    (documentation) and ``__schemas__`` (validation_middleware)
+    """
+
+    schema: Schema
+    location: str
+    put_into: Optional[str] = None
+    data_class: Any = None
+    pool: Optional[SchemaPool] = None
+    required: bool = False
+    example: Optional[dict] = None
+    add_to_refs: bool = False
+
+
 def request_schema(
-    schema, location="json", put_into=None, example=None, add_to_refs=False, **kwargs
+    schema,
+    location="json",
+    put_into=None,
+    example=None,
+    add_to_refs=False,
+    data_class=None,
+    isolated_context=False,
+    discriminator=None,
+    **kwargs,
 ):
     """
     Add request info into the swagger spec and
@@ -53,49 +86,112 @@ def request_schema(
                              if True, add example for ref schema.
                              Otherwise add example to endpoint.
                              Default False
+    :param data_class: class to materialize validated data into instead of dict.
+                       If True, a class with ``__slots__`` for schema fields
+                       is generated (field attributes must be identifiers,
+                       ``unknown=INCLUDE`` is not supported). Any other class (e.g. a dataclass)
+                       is called with validated data as keyword arguments
+                       once async validators passed, so the loaded dict is
+                       still built. Not supported for ``files`` location
+                       and schemas with ``post_load`` hooks.
+                       Default None (validated data stays dict)
+    :param bool isolated_context: if True, validation_middleware validates
+                                  every request with a pooled copy of schema
+                                  with its own ``context``,
+                                  where ``request`` key is set to current request.
+                                  Default False (schema instance is shared)
+    :param str discriminator: name of the field selecting schema, if ``schema``
+                              is a mapping of its values to schemas.
+                              validation_middleware picks schema with one
+                              dict lookup, spec has ``oneOf`` with
+                              ``discriminator``. Only for ``json`` location
     """
 
     if location not in VALID_SCHEMA_LOCATIONS:
         raise ValueError(f"Invalid location argument: {location}")
 
-    if callable(schema):
+    if isinstance(schema, dict):
+        if discriminator is None:
+            raise ValueError("`discriminator` is required for schema mapping")
+        if location != "json" or isolated_context or data_class is True:
+            raise ValueError(
+                "Schema mapping is supported only for json location, "
+                "without `isolated_context` and generated `data_class`"
+            )
+        schema = DiscriminatorSchema(schema, discriminator)
+    elif callable(schema):
         schema = schema()
-
-    options = {"required": kwargs.pop("required", False)}
+    # field names of async validators are checked when view is decorated
+    has_async_validators(schema)
+
+    if data_class is not None:
+        _check_data_class(schema, location, generated=data_class is True)
+    if data_class is True:
+        data_class = make_data_class(schema)
+
+    record = SchemaRecord(
+        schema=schema,
+        location=location,
+        put_into=put_into,
+        data_class=data_class,
+        pool=SchemaPool(schema) if isolated_context else None,
+        required=kwargs.pop("required", False),
+        example=copy.copy(example) or None,
+        add_to_refs=add_to_refs,
+    )
 
     def wrapper(func):
         if not hasattr(func, "__apispec__"):
             func.__apispec__ = {"schemas": [], "responses": {}, "parameters": []}
             func.__schemas__ = []
 
-        _example = copy.copy(example) or {}
-        if _example:
-            _example['add_to_refs'] = add_to_refs
-        func.__apispec__["schemas"].append(
-            {
-                "schema": schema,
-                "location": location,
-                "options": options,
-                "example": _example,
-            }
-        )
-
         # TODO: Remove this block?
         # "body" location was replaced by "json" location
         if location == "json" and any(
-            func_schema["location"] == "json" for func_schema in func.__schemas__
+            func_schema.location == "json" for func_schema in func.__schemas__
         ):
             raise RuntimeError("Multiple json locations are not allowed")
+        if location == "files" and any(
+            func_schema.location == "files" for func_schema in func.__schemas__
+        ):
+            raise RuntimeError("Multiple files locations are not allowed")
 
-        func.__schemas__.append(
-            {"schema": schema, "location": location, "put_into": put_into}
-        )
+        func.__apispec__["schemas"].append(record)
+        func.__schemas__.append(record)
 
         return func
 
     return wrapper
 
 
+def _check_data_class(schema, location, generated=False):
+    # data class is called with dict loaded by schema
+    if location == "files":
+        raise ValueError("`data_class` is not supported for files location")
+    if isinstance(schema, DiscriminatorSchema):
+        schemas = schema.mapping.values()
+    else:
+        schemas = (schema,)
+    if any(item._hooks.get("post_load") for item in schemas):
+        raise ValueError(
+            "`data_class` is not supported for schemas with post_load hooks"
+        )
+    if not generated:
+        return
+    # generated class has slots for loaded fields only
+    if schema.unknown == INCLUDE:
+        raise ValueError(
+            "`data_class=True` is not supported for schemas with unknown=INCLUDE"
+        )
+    for name, field in schema.load_fields.items():
+        attribute = field.attribute or name
+        if not attribute.isidentifier() or keyword.iskeyword(attribute):
+            raise ValueError(
+                "`data_class=True` requires field attributes to be identifiers, "
+                "got {!r}".format(attribute)
+            )
+
+
 # For backward compatibility
 use_kwargs = request_schema
 
@@ -107,6 +203,7 @@ querystring_schema = partial(
     request_schema, location="querystring", put_into="querystring"
 )
 form_schema = partial(request_schema, location="form", put_into="form")
+files_schema = partial(request_schema, location="files", put_into="files")
 json_schema = partial(request_schema, location="json", put_into="json")
 headers_schema = partial(request_schema, location="headers", put_into="headers")
 cookies_schema = partial(request_schema, location="cookies", put_into="cookies")
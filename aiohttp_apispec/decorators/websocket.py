@@ -0,0 +1,60 @@
+from ..discriminator import DiscriminatorSchema
+from ..websocket import MessageValidator
+
+
+def ws_message_schema(schema, discriminator=None):
+    """
+    Add schema of incoming WebSocket messages into the swagger spec
+    (``x-websocket-messages`` operation extension) and prepare
+    validator used by :func:`ws_messages <aiohttp_apispec.ws_messages>`.
+
+    Usage:
+
+    .. code-block:: python
+
+        from aiohttp import web
+        from marshmallow import Schema, fields
+
+
+        class PingSchema(Schema):
+            type = fields.Str(required=True)
+
+
+        class SubscribeSchema(Schema):
+            type = fields.Str(required=True)
+            channel = fields.Str(required=True)
+
+
+        @ws_message_schema(
+            {"ping": PingSchema, "subscribe": SubscribeSchema},
+            discriminator="type",
+        )
+        async def handler(request):
+            ws = web.WebSocketResponse()
+            await ws.prepare(request)
+            async for message in ws_messages(request, ws):
+                ...
+            return ws
+
+    :param schema: :class:`Schema <marshmallow.Schema>` class or instance,
+                   or mapping of ``discriminator`` values to them
+    :param str discriminator: name of the message field selecting its schema,
+                              required if ``schema`` is a mapping
+    """
+    if isinstance(schema, dict):
+        if discriminator is None:
+            raise ValueError("`discriminator` is required for schema mapping")
+        schema = DiscriminatorSchema(schema, discriminator)
+    elif callable(schema):
+        schema = schema()
+    validator = MessageValidator(schema)
+
+    def wrapper(func):
+        if not hasattr(func, "__apispec__"):
+            func.__apispec__ = {"schemas": [], "responses": {}, "parameters": []}
+            func.__schemas__ = []
+        func.__apispec__["ws_messages"] = schema
+        func.__ws_validator__ = validator
+        return func
+
+    return wrapper
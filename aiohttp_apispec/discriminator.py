@@ -0,0 +1,95 @@
+from marshmallow import Schema, ValidationError
+
+
+class DiscriminatorSchema(Schema):
+    """
+    Loads data with one of schemas selected by value of ``discriminator``
+    field with a single dict lookup, instead of trying schemas one by one.
+
+    With ``many=True`` items are grouped by schema and every group
+    is loaded with one ``load(many=True)`` call, errors are keyed by item index.
+
+    :param dict mapping: discriminator values to schema classes or instances
+    :param str discriminator: name of the field selecting schema
+    """
+
+    def __init__(self, mapping, discriminator, **kwargs):
+        super().__init__(**kwargs)
+        self.mapping = {
+            value: schema() if callable(schema) else schema
+            for value, schema in mapping.items()
+        }
+        self.discriminator = discriminator
+        # attributes loaded discriminator values are put under, by schema
+        self._loaded_keys = {
+            id(schema): _loaded_key(schema, discriminator)
+            for schema in self.mapping.values()
+        }
+        self._choices_message = "Must be one of: {}.".format(
+            ", ".join(map(str, self.mapping))
+        )
+
+    def load(self, data, *, many=None, partial=None, unknown=None):
+        many = self.many if many is None else bool(many)
+        if many:
+            return self._load_many(data, partial, unknown)
+        return self.select(data).load(data, partial=partial, unknown=unknown)
+
+    def select(self, data):
+        """Returns schema for data or raises ValidationError"""
+        value = data.get(self.discriminator) if isinstance(data, dict) else None
+        try:
+            return self.mapping[value]
+        except (KeyError, TypeError):
+            raise ValidationError(
+                {self.discriminator: [self._choices_message]}
+            ) from None
+
+    def select_loaded(self, data):
+        """
+        Returns schema which loaded data or None if it can not be told,
+        e.g. schema has no discriminator field
+        """
+        for value, schema in self.mapping.items():
+            key = self._loaded_keys[id(schema)]
+            if key is not None and data.get(key, None) == value:
+                return schema
+        return None
+
+    def _load_many(self, items, partial, unknown):
+        if not isinstance(items, list):
+            raise ValidationError(["Invalid input type."])
+        groups = {}
+        errors = {}
+        for index, item in enumerate(items):
+            try:
+                schema = self.select(item)
+            except ValidationError as error:
+                errors[index] = error.messages
+            else:
+                groups.setdefault(id(schema), (schema, []))[1].append(index)
+        result = [None] * len(items)
+        for schema, indexes in groups.values():
+            try:
+                loaded = schema.load(
+                    [items[index] for index in indexes],
+                    many=True,
+                    partial=partial,
+                    unknown=unknown,
+                )
+            except ValidationError as error:
+                for position, messages in error.messages.items():
+                    errors[indexes[position]] = messages
+            else:
+                for index, item in zip(indexes, loaded):
+                    result[index] = item
+        if errors:
+            raise ValidationError(dict(sorted(errors.items())))
+        return result
+
+
+def _loaded_key(schema, discriminator):
+    for name, field in schema.load_fields.items():
+        if (field.data_key or name) == discriminator:
+            return field.attribute or name
+    return None
@@ -0,0 +1,458 @@
+import re
+import uuid
+
+from apispec.ext.marshmallow import common
+from marshmallow import Schema, ValidationError, missing, utils
+from marshmallow.exceptions import RegistryError
+
+from .parsers import handle_validation_error
+
+# OpenAPI parameter locations -> request locations used in error messages
+PARAMETER_LOCATIONS = {
+    "query": "querystring",
+    "header": "headers",
+    "path": "match_info",
+    "cookie": "cookies",
+}
+SCHEMA_KEYWORDS = (
+    "type",
+    "format",
+    "items",
+    "enum",
+    "minimum",
+    "maximum",
+    "exclusiveMinimum",
+    "exclusiveMaximum",
+    "minLength",
+    "maxLength",
+    "pattern",
+    "minItems",
+    "maxItems",
+)
+MISSING_MESSAGE = "Missing data for required field."
+
+
+class Invalid(Exception):
+    """Raised by compiled checks with marshmallow-like error messages"""
+
+    def __init__(self, messages):
+        super().__init__(messages)
+        self.messages = messages
+
+
+class OperationValidator:
+    """
+    Validates request against raw OpenAPI ``parameters`` and ``requestBody``
+    of an operation documented with :func:`docs <aiohttp_apispec.docs>`.
+
+    Every parameter is compiled once into a chain of checks.
+    Values from query string, headers and match info are converted
+    to documented types, like marshmallow fields do.
+
+    :param parameters: list of OpenAPI parameter dicts
+                       (``in: body`` parameter is used as JSON body)
+    :param request_body: OpenAPI 3 ``requestBody`` dict
+    """
+
+    def __init__(self, parameters, request_body=None):
+        self.locations = {}
+        self.body = None
+        for parameter in parameters:
+            if "$ref" in parameter:
+                continue
+            if parameter.get("in") == "body":
+                self.body = (
+                    compile_schema(parameter.get("schema", {})),
+                    _is_true(parameter.get("required")),
+                )
+                continue
+            location = PARAMETER_LOCATIONS.get(parameter.get("in"))
+            if location is None:
+                continue
+            self.locations.setdefault(location, []).append(
+                _compile_parameter(parameter)
+            )
+        if request_body is not None:
+            body_schema = (
+                request_body.get("content", {})
+                .get("application/json", {})
+                .get("schema")
+            )
+            if body_schema is not None:
+                self.body = (
+                    compile_schema(body_schema),
+                    _is_true(request_body.get("required")),
+                )
+
+    def __bool__(self):
+        return bool(self.locations) or self.body is not None
+
+    async def validate(self, request, parser):
+        """
+        Returns dict of converted parameter values (updated with JSON body
+        if it is an object), errors are passed to parser's error handler.
+        """
+        result = {}
+        for location, parameters in self.locations.items():
+            source = _SOURCES[location](request)
+            errors = {}
+            for name, load in parameters:
+                try:
+                    value = load(source)
+                except Invalid as error:
+                    errors[name] = error.messages
+                else:
+                    if value is not missing:
+                        result[name] = value
+            if errors:
+                await handle_validation_error(
+                    parser, ValidationError(errors), request, None, location
+                )
+        if self.body is not None:
+            body = await self._validate_body(request, parser)
+            if isinstance(body, dict):
+                result.update(body)
+            elif body is not missing:
+                result = body
+        return result
+
+    async def _validate_body(self, request, parser):
+        check, required = self.body
+        messages = None
+        body = missing
+        if request.body_exists:
+            try:
+                body = await request.json()
+            except ValueError:
+                # JSONDecodeError and UnicodeDecodeError
+                messages = ["Invalid JSON body."]
+        if messages is None:
+            if body is missing:
+                if not required:
+                    return missing
+                messages = [MISSING_MESSAGE]
+            else:
+                try:
+                    return check(body)
+                except Invalid as error:
+                    messages = error.messages
+        await handle_validation_error(
+            parser, ValidationError(messages), request, None, "json"
+        )
+
+
+def compile_operation(data):
+    """
+    Returns :class:`OperationValidator` for ``__apispec__`` data
+    or None if there is nothing to validate.
+    """
+    validator = OperationValidator(data.get("parameters", []), data.get("requestBody"))
+    return validator or None
+
+
+def _compile_parameter(parameter):
+    name = parameter["name"]
+    required = parameter.get("in") == "path" or _is_true(parameter.get("required"))
+    schema = parameter.get("schema")
+    if schema is None:
+        # OpenAPI 2 parameter keeps schema keywords in itself
+        schema = {key: parameter[key] for key in SCHEMA_KEYWORDS if key in parameter}
+    is_array = schema.get("type") == "array"
+    delimited = (
+        parameter.get("collectionFormat") == "csv" or parameter.get("explode") is False
+    )
+    check = compile_schema(schema, coerce=True)
+
+    def load(source):
+        if is_array:
+            values = source.getall(name, []) if hasattr(source, "getall") else []
+            if delimited:
+                values = [item for value in values for item in value.split(",")]
+            value = values or missing
+        else:
+            value = source.get(name, missing)
+        if value is missing:
+            if required:
+                raise Invalid([MISSING_MESSAGE])
+            return missing
+        return check(value)
+
+    return name, load
+
+
+def compile_schema(schema, coerce=False):
+    """
+    Compiles JSON schema subset used in OpenAPI into a function which
+    returns converted value or raises :class:`Invalid`.
+
+    :param schema: schema dict, ``$ref`` and unknown keywords are ignored.
+                   :class:`Schema <marshmallow.Schema>` class, instance
+                   or name is loaded with marshmallow
+    :param bool coerce: convert strings to documented type
+                        (for query string, headers and path values)
+    """
+    if not isinstance(schema, dict):
+        return _marshmallow_check(schema)
+    checks = []
+    type_ = schema.get("type")
+    if type_ in _TYPE_CHECKS:
+        checks.append(_TYPE_CHECKS[type_](coerce))
+    if "format" in schema and schema["format"] in _FORMAT_CHECKS:
+        checks.append(_FORMAT_CHECKS[schema["format"]])
+    if "enum" in schema:
+        checks.append(_enum_check(schema["enum"]))
+    checks.extend(_range_checks(schema))
+    if "pattern" in schema:
+        checks.append(_pattern_check(schema["pattern"]))
+    if type_ == "array" and "items" in schema:
+        checks.append(_items_check(compile_schema(schema["items"], coerce)))
+    if type_ == "object" or "properties" in schema:
+        checks.append(_object_check(schema))
+    nullable = schema.get("nullable", False) or schema.get("x-nullable", False)
+
+    def check(value):
+        if value is None:
+            if nullable:
+                return None
+            raise Invalid(["Field may not be null."])
+        for check_ in checks:
+            value = check_(value)
+        return value
+
+    return check
+
+
+def _marshmallow_check(schema):
+    try:
+        schema = common.resolve_schema_instance(schema)
+    except RegistryError:
+        schema = None
+    if not isinstance(schema, Schema):
+        # not a schema, nothing to validate against
+        return lambda value: value
+
+    def check(value):
+        try:
+            return schema.load(value)
+        except ValidationError as error:
+            raise Invalid(error.messages) from None
+
+    return check
+
+
+def _is_true(value):
+    # some specs have string values like "required": "true"
+    return value is True or value == "true"
+
+
+def _integer_check(coerce):
+    def check(value):
+        if coerce and isinstance(value, str):
+            try:
+                return int(value)
+            except ValueError:
+                pass
+        elif isinstance(value, int) and not isinstance(value, bool):
+            return value
+        raise Invalid(["Not a valid integer."])
+
+    return check
+
+
+def _number_check(coerce):
+    def check(value):
+        if coerce and isinstance(value, str):
+            try:
+                return float(value)
+            except ValueError:
+                pass
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value
+        raise Invalid(["Not a valid number."])
+
+    return check
+
+
+def _boolean_check(coerce):
+    values = {"true": True, "1": True, "false": False, "0": False}
+
+    def check(value):
+        if isinstance(value, bool):
+            return value
+        if coerce and isinstance(value, str) and value.lower() in values:
+            return values[value.lower()]
+        raise Invalid(["Not a valid boolean."])
+
+    return check
+
+
+def _instance_check(types, message):
+    def factory(coerce):
+        def check(value):
+            if not isinstance(value, types):
+                raise Invalid([message])
+            return value
+
+        return check
+
+    return factory
+
+
+_TYPE_CHECKS = {
+    "integer": _integer_check,
+    "number": _number_check,
+    "boolean": _boolean_check,
+    "string": _instance_check(str, "Not a valid string."),
+    "array": _instance_check(list, "Not a valid list."),
+    "object": _instance_check(dict, "Invalid input type."),
+}
+
+
+def _format_check(parse, message):
+    def check(value):
+        if isinstance(value, str):
+            try:
+                parse(value)
+            except ValueError:
+                raise Invalid([message]) from None
+        return value
+
+    return check
+
+
+_FORMAT_CHECKS = {
+    "uuid": _format_check(uuid.UUID, "Not a valid UUID."),
+    "date": _format_check(utils.from_iso_date, "Not a valid date."),
+    "date-time": _format_check(utils.from_iso_datetime, "Not a valid datetime."),
+}
+
+
+def _enum_check(choices):
+    message = "Must be one of: {}.".format(", ".join(map(str, choices)))
+
+    def check(value):
+        if value not in choices:
+            raise Invalid([message])
+        return value
+
+    return check
+
+
+def _range_checks(schema):
+    checks = []
+    for key, size, compare, message in (
+        ("minimum", False, lambda v, b: v >= b, "greater than or equal to {}"),
+        ("maximum", False, lambda v, b: v <= b, "less than or equal to {}"),
+        ("minLength", True, lambda v, b: v >= b, "Shorter than minimum length {}."),
+        ("maxLength", True, lambda v, b: v <= b, "Longer than maximum length {}."),
+        ("minItems", True, lambda v, b: v >= b, "Shorter than minimum length {}."),
+        ("maxItems", True, lambda v, b: v <= b, "Longer than maximum length {}."),
+    ):
+        if key not in schema:
+            continue
+        bound = schema[key]
+        exclusive = schema.get("exclusive" + key[:1].upper() + key[1:]) is True
+        if not size:
+            if exclusive:
+                message = message.replace(" or equal to", "")
+            message = "Must be {}.".format(message)
+        checks.append(_bound_check(bound, compare, exclusive, size, message))
+    return checks
+
+
+def _bound_check(bound, compare, exclusive, size, message):
+    message = message.format(bound)
+
+    def check(value):
+        if size:
+            if not isinstance(value, (str, list)):
+                return value
+            measured = len(value)
+        else:
+            measured = _as_number(value)
+        if not compare(measured, bound) or (exclusive and measured == bound):
+            raise Invalid([message])
+        return value
+
+    return check
+
+
+def _as_number(value):
+    # bounds of parameters without documented type are compared as numbers
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    raise Invalid(["Not a valid number."])
+
+
+def _pattern_check(pattern):
+    regex = re.compile(pattern)
+    message = "String does not match expected pattern."
+
+    def check(value):
+        if isinstance(value, str) and regex.search(value) is None:
+            raise Invalid([message])
+        return value
+
+    return check
+
+
+def _items_check(item_check):
+    def check(value):
+        result = []
+        errors = {}
+        for index, item in enumerate(value):
+            try:
+                result.append(item_check(item))
+            except Invalid as error:
+                errors[index] = error.messages
+        if errors:
+            raise Invalid(errors)
+        return result
+
+    return check
+
+
+def _object_check(schema):
+    properties = {
+        name: compile_schema(property_schema)
+        for name, property_schema in schema.get("properties", {}).items()
+    }
+    required = tuple(schema.get("required", ()))
+    additional = schema.get("additionalProperties", True)
+
+    def check(value):
+        if not isinstance(value, dict):
+            raise Invalid(["Invalid input type."])
+        result = {}
+        errors = {}
+        for name in required:
+            if name not in value:
+                errors[name] = [MISSING_MESSAGE]
+        for name, item in value.items():
+            if name in properties:
+                try:
+                    result[name] = properties[name](item)
+                except Invalid as error:
+                    errors[name] = error.messages
+            elif additional is False:
+                errors[name] = ["Unknown field."]
+            else:
+                result[name] = item
+        if errors:
+            raise Invalid(errors)
+        return result
+
+    return check
+
+
+_SOURCES = {
+    "querystring": lambda request: request.rel_url.query,
+    "headers": lambda request: request.headers,
+    "match_info": lambda request: request.match_info,
+    "cookies": lambda request: request.cookies,
+}
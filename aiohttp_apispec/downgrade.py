@@ -0,0 +1,304 @@
+import copy
+from urllib.parse import urlsplit
+
+REF_PREFIXES = (
+    ("#/components/schemas/", "#/definitions/"),
+    ("#/components/parameters/", "#/parameters/"),
+    ("#/components/responses/", "#/responses/"),
+)
+# schema keywords which are parameter fields in OpenAPI 2
+PARAMETER_SCHEMA_KEYS = (
+    "type",
+    "format",
+    "items",
+    "default",
+    "enum",
+    "minimum",
+    "maximum",
+    "exclusiveMinimum",
+    "exclusiveMaximum",
+    "minLength",
+    "maxLength",
+    "pattern",
+    "minItems",
+    "maxItems",
+    "uniqueItems",
+    "multipleOf",
+)
+FORM_CONTENT_TYPES = ("application/x-www-form-urlencoded", "multipart/form-data")
+SECURITY_FLOWS = (
+    ("implicit", "implicit"),
+    ("password", "password"),
+    ("clientCredentials", "application"),
+    ("authorizationCode", "accessCode"),
+)
+
+
+def to_swagger2(spec: dict) -> dict:
+    """
+    Converts OpenAPI 3 spec dict built by :class:`AiohttpApiSpec`
+    into Swagger 2.0 spec dict.
+
+    Features missing in Swagger 2.0 are kept as extensions
+    (``oneOf`` as ``x-oneOf`` etc.) or dropped (``writeOnly``).
+    """
+    spec = _rewrite_refs(copy.deepcopy(spec))
+    result = {"swagger": "2.0"}
+    for key, value in spec.items():
+        if key == "openapi":
+            continue
+        if key == "servers":
+            result.update(_convert_servers(value))
+        elif key == "components":
+            result.update(_convert_components(value))
+        elif key == "paths":
+            result["paths"] = {
+                path: _convert_path_item(item) for path, item in value.items()
+            }
+        else:
+            result[key] = value
+    return result
+
+
+def _rewrite_refs(value):
+    if isinstance(value, dict):
+        ref = value.get("$ref")
+        if isinstance(ref, str):
+            for prefix, replacement in REF_PREFIXES:
+                if ref.startswith(prefix):
+                    value["$ref"] = ref.replace(prefix, replacement)
+                    break
+        for item in value.values():
+            _rewrite_refs(item)
+    elif isinstance(value, list):
+        for item in value:
+            _rewrite_refs(item)
+    return value
+
+
+def _convert_servers(servers):
+    if not servers:
+        return {}
+    url = urlsplit(servers[0]["url"])
+    result = {}
+    if url.netloc:
+        result["host"] = url.netloc
+    if url.scheme:
+        result["schemes"] = sorted(
+            {urlsplit(server["url"]).scheme for server in servers} - {""}
+        )
+    if url.path and url.path != "/":
+        result["basePath"] = url.path
+    return result
+
+
+def _convert_components(components):
+    result = {}
+    if "schemas" in components:
+        result["definitions"] = {
+            name: _convert_schema(schema)
+            for name, schema in components["schemas"].items()
+        }
+    if "parameters" in components:
+        result["parameters"] = {
+            name: _convert_parameter(parameter)
+            for name, parameter in components["parameters"].items()
+        }
+    if "responses" in components:
+        result["responses"] = {
+            name: _convert_response(response)
+            for name, response in components["responses"].items()
+        }
+    if "securitySchemes" in components:
+        result["securityDefinitions"] = {
+            name: _convert_security_scheme(scheme)
+            for name, scheme in components["securitySchemes"].items()
+        }
+    return result
+
+
+def _convert_schema(schema):
+    if not isinstance(schema, dict):
+        return schema
+    result = {}
+    for key, value in schema.items():
+        if key == "nullable":
+            result["x-nullable"] = value
+        elif key == "writeOnly":
+            continue
+        elif key in ("oneOf", "anyOf", "not") or (
+            key == "discriminator" and isinstance(value, dict)
+        ):
+            # discriminator of OpenAPI 2 is a property name only
+            result["x-" + key] = value
+        elif key in ("items", "additionalProperties"):
+            result[key] = _convert_schema(value)
+        elif key == "properties":
+            result[key] = {name: _convert_schema(item) for name, item in value.items()}
+        elif key == "allOf":
+            result[key] = [_convert_schema(item) for item in value]
+        else:
+            result[key] = value
+    return result
+
+
+def _convert_path_item(item):
+    result = {}
+    for key, value in item.items():
+        if key == "parameters":
+            result[key] = [_convert_parameter(parameter) for parameter in value]
+        elif key in ("summary", "description", "servers"):
+            result[key] = value
+        else:
+            result[key] = _convert_operation(value)
+    return result
+
+
+def _convert_operation(operation):
+    result = {}
+    for key, value in operation.items():
+        if key == "parameters":
+            result.setdefault("parameters", []).extend(
+                _convert_parameter(parameter) for parameter in value
+            )
+        elif key == "requestBody":
+            parameters, consumes = _convert_request_body(value)
+            result.setdefault("parameters", []).extend(parameters)
+            if consumes and "consumes" not in operation:
+                result["consumes"] = consumes
+        elif key == "responses":
+            result[key] = {
+                code: _convert_response(response) for code, response in value.items()
+            }
+        elif key in ("callbacks", "servers"):
+            continue
+        else:
+            result[key] = value
+    return result
+
+
+def _convert_parameter(parameter):
+    if "$ref" in parameter or "schema" not in parameter:
+        return parameter
+    result = {}
+    for key, value in parameter.items():
+        if key in ("style", "explode", "example", "examples", "content"):
+            continue
+        if key == "schema":
+            continue
+        result[key] = value
+    if parameter["in"] == "body":
+        result["schema"] = _convert_schema(parameter["schema"])
+        return result
+    schema = parameter["schema"]
+    if "$ref" in schema:
+        # the same as apispec does for Swagger 2.0
+        result["$ref"] = schema["$ref"]
+        return result
+    for key in PARAMETER_SCHEMA_KEYS:
+        if key in schema:
+            result[key] = schema[key]
+    if "description" in schema and "description" not in result:
+        result["description"] = schema["description"]
+    if schema.get("nullable"):
+        result["x-nullable"] = True
+    if schema.get("type") == "array":
+        explode = parameter.get("explode", parameter.get("style", "form") == "form")
+        result["collectionFormat"] = "multi" if explode else "csv"
+    return result
+
+
+def _convert_request_body(request_body):
+    content = request_body.get("content", {})
+    consumes = list(content)
+    for content_type in FORM_CONTENT_TYPES:
+        if content_type in content:
+            schema = content[content_type].get("schema", {})
+            required = set(schema.get("required", ()))
+            parameters = [
+                _convert_parameter(
+                    {
+                        "in": "formData",
+                        "name": name,
+                        "required": name in required,
+                        "schema": _convert_schema(prop),
+                    }
+                )
+                for name, prop in schema.get("properties", {}).items()
+            ]
+            return parameters, consumes
+    for media in content.values():
+        parameter = {
+            "in": "body",
+            "name": "body",
+            "required": request_body.get("required", False),
+            "schema": _convert_schema(media.get("schema", {})),
+        }
+        if "description" in request_body:
+            parameter["description"] = request_body["description"]
+        return [parameter], consumes
+    return [], consumes
+
+
+def _convert_response(response):
+    if "$ref" in response:
+        return response
+    result = {}
+    for key, value in response.items():
+        if key == "content":
+            for media in value.values():
+                if "schema" in media:
+                    result["schema"] = _convert_schema(media["schema"])
+                if "example" in media:
+                    result["examples"] = {
+                        content_type: media["example"]
+                        for content_type, media in value.items()
+                        if "example" in media
+                    }
+                break
+        elif key == "headers":
+            result[key] = {
+                name: _convert_header(header) for name, header in value.items()
+            }
+        elif key == "links":
+            continue
+        else:
+            result[key] = value
+    return result
+
+
+def _convert_header(header):
+    schema = header.get("schema")
+    if schema is None:
+        return header
+    result = {key: value for key, value in header.items() if key != "schema"}
+    for key in PARAMETER_SCHEMA_KEYS:
+        if key in schema:
+            result[key] = schema[key]
+    return result
+
+
+def _convert_security_scheme(scheme):
+    scheme_type = scheme.get("type")
+    description = (
+        {"description": scheme["description"]} if "description" in scheme else {}
+    )
+    if scheme_type == "http":
+        if scheme.get("scheme", "").lower() == "basic":
+            return dict(type="basic", **description)
+        # bearer tokens are passed in Authorization header
+        return dict(
+            type="apiKey", name="Authorization", **{"in": "header"}, **description
+        )
+    if scheme_type == "oauth2":
+        flows = scheme.get("flows", {})
+        for flow_name, flow_type in SECURITY_FLOWS:
+            if flow_name in flows:
+                flow = flows[flow_name]
+                result = dict(type="oauth2", flow=flow_type, **description)
+                for key in ("authorizationUrl", "tokenUrl"):
+                    if key in flow:
+                        result[key] = flow[key]
+                result["scopes"] = flow.get("scopes", {})
+                return result
+    return scheme
@@ -0,0 +1,66 @@
+import json
+
+from aiohttp import web
+from multidict import CIMultiDict
+
+
+class RenderedValidationError(Exception):
+    """
+    Raised by :class:`ValidationErrorResponse` with an already rendered
+    response, validation_middleware returns it as is.
+    """
+
+    __slots__ = ("response",)
+
+    def __init__(self, response: web.Response):
+        super().__init__()
+        self.response = response
+
+
+class ValidationErrorResponse:
+    """
+    Validation error handler which renders error messages into a response
+    returned straight from validation_middleware, without HTTP exception
+    travelling through the rest of middlewares.
+
+    Usage:
+
+    .. code-block:: python
+
+        setup_aiohttp_apispec(
+            app, error_response=ValidationErrorResponse(status=400)
+        )
+
+    :param int status: response status (``422`` by default)
+    :param str content_type: response content type
+    :param dumps: function to serialize error messages into string
+    :param headers: extra headers for every error response
+    """
+
+    def __init__(
+        self,
+        status=422,
+        content_type="application/json",
+        dumps=json.JSONEncoder(separators=(",", ":")).encode,
+        headers=None,
+    ):
+        self.status = status
+        self.dumps = dumps
+        self.headers = CIMultiDict(headers or {})
+        self.headers["Content-Type"] = content_type
+
+    def render(self, messages, status=None, headers=None) -> web.Response:
+        response_headers = self.headers
+        if headers:
+            response_headers = self.headers.copy()
+            response_headers.update(headers)
+        return web.Response(
+            body=self.dumps(messages).encode("utf-8"),
+            status=status or self.status,
+            headers=response_headers,
+        )
+
+    def __call__(self, error, req, schema, *, error_status_code, error_headers):
+        raise RenderedValidationError(
+            self.render(error.messages, error_status_code, error_headers)
+        )
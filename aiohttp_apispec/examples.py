@@ -0,0 +1,153 @@
+import copy
+import decimal
+import enum
+
+from apispec.ext.marshmallow import common
+from marshmallow import fields, missing, validate
+
+# JSON values of fields without validators, more specific classes first
+FIELD_EXAMPLES = (
+    (fields.Email, "user@example.com"),
+    (fields.Url, "https://example.com"),
+    (fields.UUID, "3fa85f64-5717-4562-b3fc-2c963f66afa6"),
+    (fields.DateTime, "2020-01-01T00:00:00"),
+    (fields.Date, "2020-01-01"),
+    (fields.Time, "00:00:00"),
+    (fields.TimeDelta, 0),
+    (fields.IPv6, "::1"),
+    (fields.IP, "127.0.0.1"),
+    (fields.Boolean, True),
+    (fields.Integer, 0),
+    (fields.Number, 0.0),
+    (fields.String, "string"),
+    (fields.Mapping, {}),
+)
+
+
+def generate_example(schema, memo=None):
+    """
+    Returns deterministic example of data loaded by schema, keyed by
+    ``data_key`` of fields.
+
+    ``example`` metadata and non-callable ``load_default`` of fields are used
+    as is, otherwise values satisfy ``OneOf``, ``Equal``, ``Range``
+    and ``Length`` validators. Self referencing nested schemas are omitted.
+
+    :param schema: :class:`Schema <marshmallow.Schema>` class or instance
+    :param dict memo: examples of already generated schemas by schema key,
+                      pass the same dict to generate every schema once
+    """
+    instance = common.resolve_schema_instance(schema)
+    memo = {} if memo is None else memo
+    example = _schema_example(instance, memo, ())
+    if instance.many:
+        example = [example]
+    return copy.deepcopy(example)
+
+
+def _schema_example(schema, memo, stack):
+    key = common.make_schema_key(schema)
+    if key in memo:
+        return memo[key]
+    stack = stack + (key,)
+    example = {}
+    for name, field in schema.fields.items():
+        value = _field_example(field, memo, stack)
+        if value is not missing:
+            example[field.data_key or name] = value
+    memo[key] = example
+    return example
+
+
+def _field_example(field, memo, stack):
+    if "example" in field.metadata:
+        return field.metadata["example"]
+    default = field.load_default
+    if default is not missing and not callable(default):
+        return _jsonable(default)
+    validators = field.validators
+    for validator in validators:
+        if isinstance(validator, validate.OneOf) and validator.choices:
+            return _jsonable(next(iter(validator.choices)))
+        if isinstance(validator, validate.Equal):
+            return _jsonable(validator.comparable)
+    if isinstance(field, fields.Pluck):
+        nested = field.schema
+        if common.make_schema_key(nested) in stack:
+            return missing
+        value = _field_example(nested.fields[field.field_name], memo, stack)
+        return [value] if field.many and value is not missing else value
+    if isinstance(field, fields.Nested):
+        nested = field.schema
+        if common.make_schema_key(nested) in stack:
+            return missing
+        example = _schema_example(nested, memo, stack)
+        return [example] if nested.many else example
+    if isinstance(field, fields.List):
+        item = _field_example(field.inner, memo, stack)
+        if item is missing:
+            return []
+        return [item] * _size(validators, 1)
+    if isinstance(field, fields.Tuple):
+        items = [_field_example(inner, memo, stack) for inner in field.tuple_fields]
+        return [None if item is missing else item for item in items]
+    if isinstance(field, fields.Enum):
+        member = next(iter(field.enum))
+        return _jsonable(member.value) if field.by_value else member.name
+    if isinstance(field, fields.Constant):
+        return _jsonable(field.constant)
+    for field_cls, value in FIELD_EXAMPLES:
+        if isinstance(field, field_cls):
+            break
+    else:
+        return None
+    if isinstance(value, str) and field_cls is fields.String:
+        size = _size(validators, len(value))
+        return (value * (size // len(value) + 1))[:size]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = _in_range(validators, value)
+        return int(value) if isinstance(field, fields.Integer) else value
+    return value
+
+
+def _size(validators, default):
+    for validator in validators:
+        if isinstance(validator, validate.Length):
+            if validator.equal is not None:
+                return validator.equal
+            if validator.min is not None and default < validator.min:
+                return validator.min
+            if validator.max is not None and default > validator.max:
+                return validator.max
+    return default
+
+
+def _in_range(validators, value):
+    for validator in validators:
+        if not isinstance(validator, validate.Range):
+            continue
+        if validator.min is not None and (
+            value < validator.min
+            or value == validator.min
+            and not validator.min_inclusive
+        ):
+            value = validator.min if validator.min_inclusive else validator.min + 1
+        if validator.max is not None and (
+            value > validator.max
+            or value == validator.max
+            and not validator.max_inclusive
+        ):
+            value = validator.max if validator.max_inclusive else validator.max - 1
+    return value
+
+
+def _jsonable(value):
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return value
@@ -1,7 +1,30 @@
+import asyncio
+import copy
+import inspect
+from functools import partial
+
 from aiohttp import web
+from marshmallow import ValidationError
 
+from .async_validation import has_async_validators, run_async_validators
+from .docs_validation import compile_operation
+from .errors import RenderedValidationError
+from .multipart import parse_multipart
+from .parsers import handle_validation_error
+from .policy import minimal_decode
 from .utils import issubclass_py37fix
 
+# form data of multipart request validated after files are read
+FORM_PENDING = object()
+# request key of multipart stream to finish after handler
+MULTIPART_STREAM = "_apispec_multipart_stream"
+
+
+def to_data_class(data_class, data):
+    if isinstance(data, list):
+        return [data_class(**item) for item in data]
+    return data_class(**data)
+
 
 @web.middleware
 async def validation_middleware(request: web.Request, handler) -> web.Response:
@@ -25,19 +48,60 @@ async def validation_middleware(request: web.Request, handler) -> web.Response:
             return await handler(request)
         if not hasattr(sub_handler, "__schemas__"):
             return await handler(request)
-        schemas = sub_handler.__schemas__
+        view = sub_handler
     else:
-        schemas = orig_handler.__schemas__
+        view = orig_handler
+    schemas = view.__schemas__
+    try:
+        if not schemas and request.app.get("_apispec_docs_validators") is not None:
+            result = await _validate_docs(request, view)
+        else:
+            decode = _skip_validation(request, schemas)
+            result = await _parse_schemas(request, schemas, decode)
+        request[request.app["_apispec_request_data_name"]] = result
+        # files are validated while handler reads them
+        response = await handler(request)
+        files = request.get(MULTIPART_STREAM)
+        if files is not None:
+            # parts left unread by handler are validated too
+            await files.finish()
+        return response
+    except RenderedValidationError as error:
+        return error.response
+
+
+def _skip_validation(request: web.Request, schemas):
+    policy = request.app.get("_apispec_validation_policy")
+    if policy is None or not schemas:
+        return False
+    # files are streamed and validated while handler reads them
+    if any(schema.location == "files" for schema in schemas):
+        return False
+    return not policy.should_validate(request)
+
+
+async def _parse_schemas(request: web.Request, schemas, decode=False):
     result = []
+    multipart = None if decode else await _parse_multipart(request, schemas)
+    loaded = []
     for schema in schemas:
-        data = await request.app["_apispec_parser"].parse(
-            schema["schema"],
-            request,
-            location=schema["location"],
-            unknown=None,  # Pass None to use the schema’s setting instead.
-        )
-        if schema["put_into"]:
-            request[schema["put_into"]] = data
+        if decode:
+            data = await _decode_schema(request, schema)
+        elif multipart is not None and schema.location in multipart:
+            data = multipart[schema.location]
+            if data is FORM_PENDING:
+                # stored by _store_form once multipart stream is read
+                continue
+        else:
+            data = await _parse_cached_schema(request, schema)
+        loaded.append((schema, data))
+    if not decode:
+        await _run_async_validators(request, loaded)
+    for schema, data in loaded:
+        if schema.data_class is not None:
+            data = to_data_class(schema.data_class, data)
+        if schema.put_into:
+            request[schema.put_into] = data
         elif data:
             try:
                 if isinstance(data, list):
@@ -47,5 +111,117 @@ async def validation_middleware(request: web.Request, handler) -> web.Response:
             except (ValueError, TypeError):
                 result = data
                 break
-    request[request.app["_apispec_request_data_name"]] = result
-    return await handler(request)
+    return result
+
+
+async def _store_form(request: web.Request, schema, data):
+    """Stores form validated at the end of multipart stream"""
+    await _run_async_validators(request, [(schema, data)])
+    if schema.data_class is not None:
+        data = to_data_class(schema.data_class, data)
+    if schema.put_into:
+        request[schema.put_into] = data
+    elif data:
+        request[request.app["_apispec_request_data_name"]] = data
+
+
+async def _run_async_validators(request: web.Request, loaded):
+    """Runs async validators of all schemas concurrently"""
+    pending = [
+        (schema, data)
+        for schema, data in loaded
+        if data and has_async_validators(schema.schema)
+    ]
+    if not pending:
+        return
+    results = await asyncio.gather(
+        *(
+            run_async_validators(schema.schema, data, request)
+            for schema, data in pending
+        ),
+        return_exceptions=True,
+    )
+    for (schema, _), error in zip(pending, results):
+        if isinstance(error, ValidationError):
+            await handle_validation_error(
+                request.app["_apispec_parser"],
+                error,
+                request,
+                schema.schema,
+                schema.location,
+            )
+        elif error is not None:
+            raise error
+
+
+async def _validate_docs(request: web.Request, view):
+    """Validates request against raw parameters of docs-only view"""
+    validators = request.app["_apispec_docs_validators"]
+    try:
+        validator = validators[view]
+    except KeyError:
+        validator = validators[view] = compile_operation(view.__apispec__)
+    if validator is None:
+        return []
+    return await validator.validate(request, request.app["_apispec_parser"])
+
+
+async def _parse_schema(request: web.Request, schema):
+    pool = schema.pool
+    if pool is None:
+        instance = schema.schema
+    else:
+        instance = pool.acquire({"request": request})
+    try:
+        return await request.app["_apispec_parser"].parse(
+            instance,
+            request,
+            location=schema.location,
+            unknown=None,  # Pass None to use the schema’s setting instead.
+        )
+    finally:
+        if pool is not None:
+            pool.release(instance)
+
+
+async def _parse_cached_schema(request: web.Request, schema):
+    cache = request.app.get("_apispec_validation_cache")
+    key = cache.make_key(request, schema) if cache is not None else None
+    if key is None:
+        return await _parse_schema(request, schema)
+    data = cache.get(key)
+    if data is None:
+        data = await _parse_schema(request, schema)
+        cache.put(key, data)
+    # views may change their data (nested ones too), cached one stays intact
+    return copy.deepcopy(data)
+
+
+async def _decode_schema(request: web.Request, schema):
+    """Loads request data for schema without validation"""
+    data = request.app["_apispec_parser"]._load_location_data(
+        schema=schema.schema, req=request, location=schema.location
+    )
+    if inspect.isawaitable(data):
+        data = await data
+    return minimal_decode(schema.schema, data)
+
+
+async def _parse_multipart(request: web.Request, schemas):
+    """Streams multipart body if there is a files schema, instead of request.post()"""
+    files_schema = form = None
+    for schema in schemas:
+        if schema.location == "files":
+            files_schema = schema.schema
+        elif schema.location == "form":
+            form = schema
+    if files_schema is None:
+        return None
+    form_data, files = await parse_multipart(
+        request, form.schema if form is not None else None, files_schema
+    )
+    request[MULTIPART_STREAM] = files
+    if files.form_pending:
+        files.on_form = partial(_store_form, request, form)
+        form_data = FORM_PENDING
+    return {"form": form_data, "files": files}
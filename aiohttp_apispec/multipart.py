@@ -0,0 +1,272 @@
+from fnmatch import fnmatch
+from functools import lru_cache
+
+from aiohttp import hdrs, web
+from marshmallow import RAISE, ValidationError
+from multidict import MultiDict
+
+from .parsers import handle_validation_error
+
+CHUNK_SIZE = 2**16
+
+
+class UploadedFile:
+    """
+    File part of multipart request.
+    Its content is read by chunks checking ``max_size`` of the files schema field.
+    """
+
+    __slots__ = ("name", "filename", "content_type", "size", "_part", "_stream")
+
+    def __init__(self, part, stream):
+        self.name = part.name
+        self.filename = part.filename
+        self.content_type = part.headers.get(hdrs.CONTENT_TYPE, "")
+        self.size = 0
+        self._part = part
+        self._stream = stream
+
+    async def read_chunk(self, size=CHUNK_SIZE) -> bytes:
+        """Returns next chunk of file content, empty bytes at the end of file"""
+        chunk = await self._part.read_chunk(size)
+        self.size += len(chunk)
+        max_size = self._stream.limits[self.name][0]
+        if max_size is not None and self.size > max_size:
+            await self._stream.error(
+                self.name, "File is larger than {} bytes.".format(max_size)
+            )
+        return chunk
+
+    async def read(self) -> bytes:
+        """Reads the whole file into memory"""
+        chunks = []
+        while True:
+            chunk = await self.read_chunk()
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+    def __aiter__(self):
+        return self._iter_chunks()
+
+    async def _iter_chunks(self):
+        while True:
+            chunk = await self.read_chunk()
+            if not chunk:
+                return
+            yield chunk
+
+    def at_eof(self) -> bool:
+        return self._part.at_eof()
+
+    async def release(self):
+        await self._part.release()
+
+
+class MultipartStream:
+    """
+    Async iterator over file parts of multipart request
+    placed into request by validation_middleware for ``files`` schema.
+
+    Every part is checked against files schema: unknown names, content types
+    from ``content_types`` field metadata and, while reading, sizes from
+    ``max_size`` field metadata. Required files are checked at the end of stream.
+    Errors are passed to the error handler of the app's parser.
+
+    Text fields sent between or after files are collected into ``form``
+    and validated with ``form_schema`` at the end of stream,
+    then ``on_form`` is awaited with validated form data.
+    Parts left unread by the handler are checked by :meth:`finish`.
+    """
+
+    def __init__(
+        self, request, schema, reader=None, part=None, form_schema=None, form=None
+    ):
+        self.request = request
+        self.schema = schema
+        self.limits = _get_limits(schema)
+        self.form_schema = form_schema
+        self.form = form
+        self.on_form = None
+        self._reader = reader
+        self._next_part = part
+        self._current = None
+        self._seen = set()
+        self._finished = False
+
+    @property
+    def form_pending(self) -> bool:
+        """True until form collected by the stream is validated"""
+        return self.form is not None
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> UploadedFile:
+        while True:
+            if self._current is not None:
+                await self._current.release()
+                self._current = None
+            if self._finished:
+                raise StopAsyncIteration
+            part = await self._get_part()
+            if part is None:
+                self._finished = True
+                await self._load_form()
+                await self._check_required()
+                raise StopAsyncIteration
+            if part.filename is None:
+                # browsers send parts in the order of form inputs
+                if self.form is not None:
+                    self.form.add(
+                        part.name,
+                        await read_text(self.request, self.form_schema, part),
+                    )
+                else:
+                    await part.release()
+                continue
+            if part.name not in self.limits:
+                if self.schema.unknown == RAISE:
+                    await self.error(part.name, "Unknown field.")
+                await part.release()
+                continue
+            uploaded = UploadedFile(part, self)
+            content_types = self.limits[part.name][1]
+            if content_types and not any(
+                fnmatch(uploaded.content_type, pattern) for pattern in content_types
+            ):
+                await self.error(
+                    part.name,
+                    "Unsupported content type: {}.".format(uploaded.content_type),
+                )
+            self._seen.add(part.name)
+            self._current = uploaded
+            return uploaded
+
+    async def finish(self):
+        """Releases unread parts, validates form and checks required files"""
+        async for _ in self:
+            pass
+
+    async def error(self, name, message):
+        await _error(self.request, self.schema, "files", name, message)
+
+    async def _get_part(self):
+        if self._next_part is not None:
+            part, self._next_part = self._next_part, None
+            return part
+        if self._reader is None:
+            return None
+        return await self._reader.next()
+
+    async def _load_form(self):
+        if self.form is None:
+            return
+        form, self.form = self.form, None
+        data = await load_form(self.request, self.form_schema, form)
+        if self.on_form is not None:
+            await self.on_form(data)
+
+    async def _check_required(self):
+        missing_files = [
+            name
+            for name, (_, _, required) in self.limits.items()
+            if required and name not in self._seen
+        ]
+        if missing_files:
+            error = ValidationError(
+                {name: ["Missing data for required field."] for name in missing_files}
+            )
+            await handle_validation_error(
+                self.request.app["_apispec_parser"],
+                error,
+                self.request,
+                self.schema,
+                "files",
+            )
+
+
+async def parse_multipart(request: web.Request, form_schema, files_schema):
+    """
+    Reads text fields of multipart request up to the first file part.
+    Returns form data validated with form schema (if any)
+    and :class:`MultipartStream` for the rest of parts.
+
+    If there are file parts, text fields may follow them, so form is validated
+    by the stream at its end and None is returned instead of form data.
+    """
+    form = MultiDict()
+    reader = part = None
+    if request.content_type.startswith("multipart/"):
+        reader = await request.multipart()
+        while True:
+            part = await reader.next()
+            if part is None or part.filename is not None:
+                break
+            form.add(part.name, await read_text(request, form_schema, part))
+    if part is not None and form_schema is not None:
+        stream = MultipartStream(
+            request, files_schema, reader, part, form_schema=form_schema, form=form
+        )
+        return None, stream
+    form_data = None
+    if form_schema is not None:
+        form_data = await load_form(request, form_schema, form)
+    return form_data, MultipartStream(request, files_schema, reader, part)
+
+
+async def read_text(request: web.Request, schema, part) -> str:
+    """
+    Reads text field of multipart request by chunks,
+    checking ``max_form_field_size`` of the app.
+    """
+    max_size = request.app["_apispec_max_form_field_size"]
+    chunks = []
+    size = 0
+    while True:
+        chunk = await part.read_chunk(CHUNK_SIZE)
+        if not chunk:
+            break
+        size += len(chunk)
+        if max_size is not None and size > max_size:
+            await _error(
+                request,
+                schema,
+                "form",
+                part.name,
+                "Field is larger than {} bytes.".format(max_size),
+            )
+        chunks.append(chunk)
+    data = part.decode(b"".join(chunks))
+    return data.decode(part.get_charset(default="utf-8"))
+
+
+async def load_form(request: web.Request, schema, form):
+    """Validates text fields of multipart request with form schema"""
+    parser = request.app["_apispec_parser"]
+    try:
+        return schema.load(parser._makeproxy(form, schema))
+    except ValidationError as error:
+        await handle_validation_error(parser, error, request, schema, "form")
+
+
+@lru_cache(maxsize=None)
+def _get_limits(schema):
+    limits = {}
+    for name, field in schema.load_fields.items():
+        limits[field.data_key or name] = (
+            field.metadata.get("max_size"),
+            field.metadata.get("content_types"),
+            field.required,
+        )
+    return limits
+
+
+async def _error(request, schema, location, name, message):
+    await handle_validation_error(
+        request.app["_apispec_parser"],
+        ValidationError({name: [message]}),
+        request,
+        schema,
+        location,
+    )
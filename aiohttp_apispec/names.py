@@ -0,0 +1,119 @@
+from apispec.ext.marshmallow import common
+from marshmallow import Schema
+
+from .utils import iter_nested_fields
+
+# locations of request schemas added to spec components as a whole
+COMPONENT_LOCATIONS = ("json", "body")
+
+
+class SchemaNameIndex:
+    """
+    Resolves component names with ``resolver`` once per schema class
+    and modifiers (``only``, ``exclude``, ``partial`` etc.).
+
+    If different schemas are resolved to one name, they get numbered
+    names (``Name``, ``Name1``, ...) in order of their class paths and
+    modifiers, so names do not depend on order of routes. Names of schemas
+    used by views are reserved by :meth:`index` before spec is built.
+
+    :param resolver: schema name resolver, see ``schema_name_resolver``
+                     of :class:`MarshmallowPlugin`
+    """
+
+    def __init__(self, resolver):
+        self.resolver = resolver
+        # schema instances by component name
+        self.schemas = {}
+        self._names = {}
+        self._by_instance = {}
+        self._taken = set()
+
+    def __call__(self, schema):
+        if isinstance(schema, Schema):
+            try:
+                return self._by_instance[schema]
+            except KeyError:
+                pass
+        instance = common.resolve_schema_instance(schema)
+        key = common.make_schema_key(instance)
+        try:
+            name = self._names[key]
+        except KeyError:
+            name = self._names[key] = self._unique(self.resolver(instance))
+        if name:
+            self.schemas.setdefault(name, instance)
+        if isinstance(schema, Schema):
+            self._by_instance[schema] = name
+        return name
+
+    def index(self, schemas):
+        """
+        Reserves names for ``(schema, is_component)`` pairs and their nested
+        schemas. Schemas which are not components themselves (e.g. query string
+        ones) are only searched for nested schemas.
+        """
+        found = {}
+        for schema, is_component in schemas:
+            _collect(common.resolve_schema_instance(schema), is_component, found)
+        by_name = {}
+        for key, instance in found.items():
+            if key in self._names:
+                continue
+            name = self.resolver(instance)
+            if name:
+                by_name.setdefault(name, []).append(key)
+            else:
+                self._names[key] = name
+        for name, keys in by_name.items():
+            # sorting is stable, so keys with equal paths keep order of routes
+            for key in sorted(keys, key=_sort_key):
+                unique = self._names[key] = self._unique(name)
+                self.schemas[unique] = found[key]
+
+    def reserve(self, schema, name):
+        """
+        Returns unique component name based on ``name`` for schema
+        which resolver returned no name for (e.g. recursive one)
+        """
+        instance = common.resolve_schema_instance(schema)
+        name = self._names[common.make_schema_key(instance)] = self._unique(name)
+        self.schemas[name] = instance
+        if isinstance(schema, Schema):
+            self._by_instance[schema] = name
+        return name
+
+    def _unique(self, name):
+        if not name:
+            return name
+        unique = name
+        counter = 0
+        while unique in self._taken:
+            counter += 1
+            unique = "{}{}".format(name, counter)
+        self._taken.add(unique)
+        return unique
+
+
+def _collect(schema, is_component, found):
+    key = common.make_schema_key(schema)
+    if is_component:
+        if key in found:
+            return
+        found[key] = schema
+    for field in schema.fields.values():
+        for nested in iter_nested_fields(field):
+            _collect(nested.schema, True, found)
+
+
+def _sort_key(key):
+    schema_cls = key[0]
+    modifiers = tuple(
+        (
+            repr(sorted(map(repr, modifier)))
+            if isinstance(modifier, frozenset)
+            else repr(modifier)
+        )
+        for modifier in key[1:]
+    )
+    return "{}.{}".format(schema_cls.__module__, schema_cls.__qualname__), modifiers
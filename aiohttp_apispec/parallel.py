@@ -0,0 +1,123 @@
+import multiprocessing
+import sys
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+from apispec.core import VALID_METHODS_OPENAPI_V2
+
+from .utils import get_route_path
+
+# (AiohttpApiSpec, routes) inherited by forked workers
+_state = None
+
+
+class SchemaNameCollision(Exception):
+    """Different schemas are resolved to one name in different partitions"""
+
+
+def build_parallel(apispec, routes, workers):
+    """
+    Converts routes to OpenAPI fragments in forked worker processes
+    and merges them into ``apispec.spec`` in route order.
+
+    Workers inherit routes and views from parent process, only JSON
+    fragments (operations and schema components) are sent back.
+    Returns False if routes were not converted (fork is not available
+    or schema names collide), so they should be registered serially.
+    """
+    global _state
+    try:
+        context = multiprocessing.get_context("fork")
+    except ValueError:
+        return False
+    executor_kwargs = {}
+    if sys.version_info >= (3, 7):
+        executor_kwargs["mp_context"] = context
+    elif multiprocessing.get_start_method() != "fork":
+        # executor of python 3.6 always uses default start method
+        return False
+    partitions = _partition(len(routes), workers)
+    _state = (apispec, routes)
+    try:
+        with ProcessPoolExecutor(len(partitions), **executor_kwargs) as executor:
+            fragments = list(executor.map(_convert_partition, partitions))
+    finally:
+        _state = None
+    try:
+        schemas = _merge_schemas(apispec.spec, fragments)
+    except SchemaNameCollision as exc:
+        warnings.warn("{}, building spec serially".format(exc))
+        return False
+    for name, component in schemas.items():
+        apispec.spec.components.schema(name, component=component)
+    for operations, _, _ in fragments:
+        for path, method, operation in operations:
+            apispec.spec.path(path=path, operations={method: operation})
+    return True
+
+
+def _partition(size, workers):
+    step, rest = divmod(size, workers)
+    bounds = []
+    start = 0
+    for index in range(workers):
+        stop = start + step + (1 if index < rest else 0)
+        if stop > start:
+            bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def _convert_partition(bounds):
+    apispec, routes = _state
+    start, stop = bounds
+    registered = []
+    for route, method, view in routes[start:stop]:
+        apispec._register_route(route, method, view)
+        route_path = get_route_path(route)
+        if (
+            hasattr(view, "__apispec__")
+            and route_path is not None
+            and method in VALID_METHODS_OPENAPI_V2
+        ):
+            registered.append((apispec.prefix + route_path.template, method))
+    spec = apispec.spec.to_dict()
+    operations = [
+        (path, method, spec["paths"][path][method]) for path, method in registered
+    ]
+    names = {
+        name: _schema_key(key) for key, name in apispec.plugin.converter.refs.items()
+    }
+    return operations, _schemas_section(spec), names
+
+
+def _merge_schemas(spec, fragments):
+    existing = _schemas_section(spec.to_dict())
+    schemas = {}
+    keys = {}
+    for _, fragment_schemas, names in fragments:
+        for name, component in fragment_schemas.items():
+            if name in existing:
+                continue
+            key = names.get(name)
+            if name in schemas and (schemas[name] != component or keys[name] != key):
+                raise SchemaNameCollision(
+                    "Multiple schemas resolved to the name {}".format(name)
+                )
+            schemas[name] = component
+            keys[name] = key
+    return schemas
+
+
+def _schemas_section(spec):
+    if "definitions" in spec:
+        return spec["definitions"]
+    return spec.get("components", {}).get("schemas", {})
+
+
+def _schema_key(key):
+    # classes are inherited by forked workers, so their ids are the same
+    schema_cls = key[0]
+    return "{}.{}@{}{!r}".format(
+        schema_cls.__module__, schema_cls.__qualname__, id(schema_cls), key[1:]
+    )
@@ -0,0 +1,240 @@
+import inspect
+
+from marshmallow import EXCLUDE, Schema, ValidationError, fields, missing
+from multidict import MultiMapping
+from webargs.aiohttpparser import AIOHTTPParser
+from webargs.core import _UNKNOWN_DEFAULT_PARAM, Parser
+
+
+async def handle_validation_error(
+    parser, error, req, schema, location, *, error_status_code=None, error_headers=None
+):
+    """
+    Passes validation error to the parser's error handler
+    the same way webargs does: messages are namespaced by location
+    and coroutine error handlers are awaited.
+    """
+    error.messages = {location: error.messages}
+    error_handler = parser.error_callback or parser.handle_error
+    result = error_handler(
+        error,
+        req,
+        schema,
+        error_status_code=error_status_code,
+        error_headers=error_headers,
+    )
+    if inspect.isawaitable(result):
+        await result
+    raise ValueError("error handler did not raise an exception") from error
+
+
+class NativeParser(AIOHTTPParser):
+    """
+    Request parser for validation_middleware which binds location loaders
+    to aiohttp request attributes once per schema and location.
+
+    Error handling is the same as in ``webargs.aiohttpparser.parser``:
+    ``error_handler``/``error_callback`` and ``handle_error`` are used.
+    Arguments other than schema instances are passed to webargs as is.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._plans = {}
+
+    async def parse(
+        self,
+        argmap,
+        req=None,
+        *,
+        location=None,
+        unknown=_UNKNOWN_DEFAULT_PARAM,
+        validate=None,
+        error_status_code=None,
+        error_headers=None,
+    ):
+        if validate is not None or req is None or not isinstance(argmap, Schema):
+            return await super().parse(
+                argmap,
+                req,
+                location=location,
+                unknown=unknown,
+                validate=validate,
+                error_status_code=error_status_code,
+                error_headers=error_headers,
+            )
+        location = location or self.location
+        key = (argmap, location, unknown)
+        try:
+            loader, is_async, load_kwargs = self._plans[key]
+        except KeyError:
+            loader, is_async, load_kwargs = self._plans[key] = self._build_plan(
+                argmap, location, unknown
+            )
+        try:
+            data = loader(req, argmap)
+            if is_async:
+                data = await data
+            if data is missing:
+                data = {}
+            return argmap.load(data, **load_kwargs)
+        except ValidationError as error:
+            await handle_validation_error(
+                self,
+                error,
+                req,
+                argmap,
+                location,
+                error_status_code=error_status_code,
+                error_headers=error_headers,
+            )
+
+    def _build_plan(self, schema, location, unknown):
+        if unknown == _UNKNOWN_DEFAULT_PARAM:
+            if self.unknown != _UNKNOWN_DEFAULT_PARAM:
+                unknown = self.unknown
+            else:
+                unknown = self.DEFAULT_UNKNOWN_BY_LOCATION.get(location)
+        load_kwargs = {"unknown": unknown} if unknown else {}
+        loader = self._get_location_loader(schema, location, unknown or schema.unknown)
+        if type(self).pre_load is not getattr(Parser, "pre_load", None):
+            loader = self._with_pre_load(loader, location)
+        return loader, inspect.iscoroutinefunction(loader), load_kwargs
+
+    def _get_location_loader(self, schema, location, unknown):
+        if location in ("match_info", "path"):
+            return _load_match_info
+        if location in ("query", "querystring"):
+            return self._query_loader(schema)
+        if location in ("headers", "cookies"):
+            getter = _get_headers if location == "headers" else _get_cookies
+            if unknown == EXCLUDE:
+                return self._declared_keys_loader(schema, getter)
+            return self._proxy_loader(schema, getter)
+        return self._get_loader(location)
+
+    def _query_loader(self, schema):
+        """
+        Returns loader which reads query string in a single pass.
+        Values of list fields are collected into lists,
+        for list fields with ``explode=False`` metadata values are split by comma.
+        """
+        multiple_keys, delimited_keys = query_list_keys(
+            schema, tuple(self.KNOWN_MULTI_FIELDS)
+        )
+        if not multiple_keys:
+            # first value of every key, as multidict returns it
+            return _load_query
+
+        def load(req, _):
+            data = {}
+            for key, value in req.rel_url.query.items():
+                if key in multiple_keys:
+                    values = value.split(",") if key in delimited_keys else [value]
+                    if key in data:
+                        data[key].extend(values)
+                    else:
+                        data[key] = values
+                elif key not in data:
+                    data[key] = value
+            return data
+
+        return load
+
+    def _declared_keys_loader(self, schema, getter):
+        """
+        Returns loader which fetches only keys declared in schema,
+        unknown keys would be excluded by schema anyway.
+        Headers are looked up case-insensitively by ``CIMultiDictProxy``.
+        """
+        multiple_keys, _ = query_list_keys(schema, tuple(self.KNOWN_MULTI_FIELDS))
+        keys = tuple((key, key in multiple_keys) for key in _load_keys(schema))
+
+        def load(req, _):
+            source = getter(req)
+            data = {}
+            for key, is_multiple in keys:
+                value = source.get(key, missing)
+                if value is missing:
+                    continue
+                if is_multiple:
+                    value = (
+                        source.getall(key)
+                        if isinstance(source, MultiMapping)
+                        else [value]
+                    )
+                data[key] = value
+            return data
+
+        return load
+
+    def _proxy_loader(self, schema, getter):
+        if not self._makeproxy({}, schema).multiple_keys:
+            # nothing to convert into lists, so original mapping works as is
+            def load(req, _):
+                return getter(req)
+
+        else:
+
+            def load(req, schema_):
+                return self._makeproxy(getter(req), schema_)
+
+        return load
+
+    def _with_pre_load(self, loader, location):
+        if inspect.iscoroutinefunction(loader):
+
+            async def load(req, schema):
+                data = await loader(req, schema)
+                return self.pre_load(data, schema=schema, req=req, location=location)
+
+        else:
+
+            def load(req, schema):
+                data = loader(req, schema)
+                return self.pre_load(data, schema=schema, req=req, location=location)
+
+        return load
+
+
+def query_list_keys(schema, known_multi_fields=(fields.List, fields.Tuple)):
+    """
+    Returns query keys of list fields
+    and keys of list fields with comma separated values (``explode=False``)
+    """
+    multiple_keys = set()
+    delimited_keys = set()
+    for name, field in schema.load_fields.items():
+        is_multiple = getattr(field, "is_multiple", None)
+        if is_multiple is None:
+            is_multiple = isinstance(field, known_multi_fields)
+        if not is_multiple:
+            continue
+        key = field.data_key if field.data_key is not None else name
+        multiple_keys.add(key)
+        if field.metadata.get("explode") is False:
+            delimited_keys.add(key)
+    return frozenset(multiple_keys), frozenset(delimited_keys)
+
+
+def _load_keys(schema):
+    return [
+        field.data_key if field.data_key is not None else name
+        for name, field in schema.load_fields.items()
+    ]
+
+
+def _load_query(req, _):
+    return req.rel_url.query
+
+
+def _load_match_info(req, _):
+    return req.match_info
+
+
+def _get_headers(req):
+    return req.headers
+
+
+def _get_cookies(req):
+    return req.cookies
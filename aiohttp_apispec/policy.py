@@ -0,0 +1,80 @@
+from marshmallow import ValidationError, missing
+
+from .discriminator import DiscriminatorSchema
+
+
+class ValidationPolicy:
+    """
+    Decides which requests validation_middleware validates with schemas.
+
+    Requests ``trusted`` returns True for (e.g. internal callers identified
+    by header, peer address or client certificate) are validated only
+    at ``sample_rate``, others always. Views of not validated requests
+    get minimal decode of request data: values are taken as is (no type
+    conversion, defaults or validators) and put under schema field attributes.
+
+    Usage:
+
+    .. code-block:: python
+
+        def is_internal(request):
+            return request.headers.get("X-Internal-Token") == TOKEN
+
+        setup_aiohttp_apispec(
+            app, validation_policy=ValidationPolicy(is_internal, sample_rate=0.01)
+        )
+
+    :param trusted: function called with request, returns True for
+                    trusted requests. Route can be checked with
+                    ``request.match_info.route.name``
+    :param float sample_rate: share of trusted requests validated anyway,
+                              from 0 (never) to 1 (always). Sampling is
+                              deterministic: every ``1 / sample_rate``-th
+                              trusted request is validated
+    """
+
+    def __init__(self, trusted, sample_rate=0.0):
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("`sample_rate` must be between 0 and 1")
+        self.trusted = trusted
+        self.sample_rate = sample_rate
+        self.skipped = 0
+        self._credit = 0.0
+
+    def should_validate(self, request) -> bool:
+        if not self.trusted(request):
+            return True
+        self._credit += self.sample_rate
+        if self._credit >= 1:
+            self._credit -= 1
+            return True
+        self.skipped += 1
+        return False
+
+
+def minimal_decode(schema, data):
+    """
+    Returns request data loaded by parser with keys renamed from
+    ``data_key`` to field attributes, without validation
+    """
+    if data is missing:
+        return {}
+    if isinstance(schema, DiscriminatorSchema):
+        try:
+            schema = schema.select(data)
+        except ValidationError:
+            return data
+    if isinstance(data, list) and schema.many:
+        return [_rename(schema, item) for item in data]
+    return _rename(schema, data)
+
+
+def _rename(schema, data):
+    if not hasattr(data, "keys"):
+        return data
+    result = {}
+    for name, field in schema.load_fields.items():
+        key = field.data_key or name
+        if key in data:
+            result[field.attribute or name] = data[key]
+    return result
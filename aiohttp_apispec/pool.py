@@ -0,0 +1,94 @@
+import copy
+from contextlib import contextmanager
+
+from marshmallow import Schema, fields
+
+from .utils import inner_fields, iter_nested_fields
+
+
+class SchemaPool:
+    """
+    Pool of schema copies with own ``context`` for concurrent requests.
+
+    Copies are made from schema instance, so schema options (``only``,
+    ``exclude``, ``unknown`` etc.) are preserved and ``__init__`` is not called.
+    Copies are made only when all pooled ones are in use and are reused
+    afterwards, so a request gets a copy with its own context for free.
+    Nested schemas of a copy share its context.
+
+    :param schema: :class:`Schema <marshmallow.Schema>` instance to copy
+    :param int maxsize: max number of idle copies kept in pool,
+                        None (by default) means no limit
+    """
+
+    def __init__(self, schema: Schema, maxsize: int = None):
+        self.schema = schema
+        self.maxsize = maxsize
+        self._idle = []
+
+    def __repr__(self):
+        return "{}({!r})".format(type(self).__name__, self.schema)
+
+    def acquire(self, context: dict = None) -> Schema:
+        """Returns schema copy with empty context updated with ``context``"""
+        try:
+            instance = self._idle.pop()
+        except IndexError:
+            instance = copy_schema(self.schema)
+        if context:
+            instance.context.update(context)
+        return instance
+
+    def release(self, instance: Schema):
+        instance.context.clear()
+        if self.maxsize is None or len(self._idle) < self.maxsize:
+            self._idle.append(instance)
+
+    @contextmanager
+    def use(self, context: dict = None):
+        instance = self.acquire(context)
+        try:
+            yield instance
+        finally:
+            self.release(instance)
+
+
+def copy_schema(schema: Schema) -> Schema:
+    """
+    Returns copy of schema instance with own fields bound to it
+    and own context, which is shared with its nested schemas.
+    """
+    instance = copy.copy(schema)
+    _bind_fields(instance, {})
+    _share_context(instance, instance.context, (type(instance),))
+    return instance
+
+
+def _bind_fields(schema, context):
+    schema.context = context
+    schema.declared_fields = copy.deepcopy(schema.declared_fields)
+    for field in schema.declared_fields.values():
+        _unbind(field)
+    schema._init_fields()
+
+
+def _unbind(field):
+    # fields are copied shallowly, so they are still bound to original schema
+    field.parent = None
+    if isinstance(field, fields.Nested):
+        field._schema = None
+    for inner in inner_fields(field):
+        _unbind(inner)
+
+
+def _share_context(schema, context, path):
+    for field in schema.fields.values():
+        for nested_field in iter_nested_fields(field):
+            nested = nested_field.schema
+            if isinstance(nested_field.nested, Schema):
+                # copy of nested instance shares fields with it
+                _bind_fields(nested, context)
+            else:
+                nested.context = context
+            if type(nested) not in path:
+                _share_context(nested, context, path + (type(nested),))
@@ -0,0 +1,110 @@
+import json
+from time import perf_counter
+
+from apispec.ext.marshmallow import common
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+class _Timer:
+    __slots__ = ("profiler", "stage", "schema", "start")
+
+    def __init__(self, profiler, stage, schema):
+        self.profiler = profiler
+        self.stage = stage
+        self.schema = schema
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.add(self.stage, perf_counter() - self.start, self.schema)
+        return False
+
+
+class SpecProfiler:
+    """
+    Collects time spent on building spec for every route and schema.
+
+    Timings are grouped by route (``route``) and stage (``measure``):
+    ``schema2parameters``, ``add_examples``, ``deepcopy`` and ``spec.path``.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.total = 0.0
+        self.routes = []
+        self.schemas = {}
+        self._current = None
+
+    def route(self, method, path):
+        if not self.enabled:
+            return _NOOP_TIMER
+        self._current = {"method": method, "path": path, "total": 0.0, "stages": {}}
+        self.routes.append(self._current)
+        return _Timer(self, None, None)
+
+    def measure(self, stage, schema=None):
+        if not self.enabled:
+            return _NOOP_TIMER
+        return _Timer(self, stage, schema)
+
+    def add(self, stage, elapsed, schema=None):
+        if stage is None:
+            self._current["total"] += elapsed
+            self.total += elapsed
+            self._current = None
+            return
+        if self._current is not None:
+            stages = self._current["stages"]
+            stages[stage] = stages.get(stage, 0.0) + elapsed
+        if schema is not None:
+            name = schema_path(schema)
+            stat = self.schemas.setdefault(name, {"time": 0.0, "calls": 0})
+            stat["time"] += elapsed
+            stat["calls"] += 1
+
+    def report(self, components=None, limit=None):
+        """
+        Returns profiling results with slowest routes and schemas first
+
+        :param dict components: spec schema components to sort by their size
+        :param int limit: max number of items in every list
+        """
+        routes = sorted(self.routes, key=lambda r: r["total"], reverse=True)
+        schemas = sorted(
+            ({"schema": name, **stat} for name, stat in self.schemas.items()),
+            key=lambda s: s["time"],
+            reverse=True,
+        )
+        sizes = sorted(
+            (
+                {"name": name, "size": len(json.dumps(component, default=str))}
+                for name, component in (components or {}).items()
+            ),
+            key=lambda c: c["size"],
+            reverse=True,
+        )
+        return {
+            "total": self.total,
+            "routes": routes[:limit],
+            "schemas": schemas[:limit],
+            "components": sizes[:limit],
+        }
+
+
+def schema_path(schema):
+    schema_cls = common.resolve_schema_cls(schema)
+    return "{}.{}".format(schema_cls.__module__, schema_cls.__qualname__)
@@ -0,0 +1,131 @@
+import json
+import re
+import time
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+SNAPSHOTS_DIR = "__snapshots__"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("aiohttp-apispec")
+    group.addoption(
+        "--apispec-snapshot-update",
+        action="store_true",
+        default=False,
+        help="create or update aiohttp-apispec spec snapshots",
+    )
+
+
+class SpecBudgetExceeded(AssertionError):
+    """Raised by :class:`SpecBudget` if spec build took too much time or memory"""
+
+
+class SpecBudget:
+    """
+    Context manager measuring wall time and peak memory allocated
+    (with :mod:`tracemalloc`) in its block, usually ``setup_aiohttp_apispec``
+    with ``in_place=True`` or ``AiohttpApiSpec.register``.
+
+    :param float seconds: max time in seconds, None to skip the check
+    :param int memory: max peak of allocated memory in bytes,
+                       None to skip the check
+    """
+
+    def __init__(self, seconds=None, memory=None):
+        self.seconds = seconds
+        self.memory = memory
+        self.elapsed = None
+        self.peak = None
+        self._tracing = False
+
+    def __enter__(self):
+        self._tracing = not tracemalloc.is_tracing()
+        if self._tracing:
+            tracemalloc.start()
+        if hasattr(tracemalloc, "reset_peak"):
+            # python 3.9+, otherwise peak of already started tracing is kept
+            tracemalloc.reset_peak()
+        self._start_memory = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.elapsed = time.perf_counter() - self._start
+        self.peak = tracemalloc.get_traced_memory()[1] - self._start_memory
+        if self._tracing:
+            tracemalloc.stop()
+        if exc_type is not None:
+            return False
+        errors = []
+        if self.seconds is not None and self.elapsed > self.seconds:
+            errors.append(
+                "took {:.3f}s, budget is {:.3f}s".format(self.elapsed, self.seconds)
+            )
+        if self.memory is not None and self.peak > self.memory:
+            errors.append(
+                "allocated {} bytes, budget is {} bytes".format(self.peak, self.memory)
+            )
+        if errors:
+            raise SpecBudgetExceeded("Spec build " + ", ".join(errors))
+        return False
+
+
+class SpecSnapshot:
+    """
+    Compares spec dict with JSON snapshot file.
+
+    :param Path path: snapshot file path
+    :param bool update: write snapshot instead of comparing
+    """
+
+    def __init__(self, path, update=False):
+        self.path = path
+        self.update = update
+
+    def __call__(self, spec):
+        """
+        Asserts that spec matches snapshot.
+
+        :param spec: :class:`AiohttpApiSpec <aiohttp_apispec.AiohttpApiSpec>`
+                     or spec dict
+        """
+        if hasattr(spec, "swagger_dict"):
+            spec = spec.swagger_dict()
+        # the same types as spec served in JSON
+        actual = json.loads(json.dumps(spec, sort_keys=True))
+        if self.update:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(str(self.path), "w", encoding="utf-8") as fp:
+                json.dump(actual, fp, indent=2, sort_keys=True)
+                fp.write("\n")
+            return
+        if not self.path.exists():
+            pytest.fail(
+                "Spec snapshot {} does not exist, "
+                "run pytest with --apispec-snapshot-update".format(self.path),
+                pytrace=False,
+            )
+        with open(str(self.path), encoding="utf-8") as fp:
+            expected = json.load(fp)
+        assert actual == expected, "Spec does not match snapshot {}".format(self.path)
+
+
+@pytest.fixture
+def apispec_snapshot(request):
+    """
+    Returns :class:`SpecSnapshot` checking spec against
+    ``__snapshots__/<module>/<test name>.json``
+    """
+    test_path = Path(str(request.node.fspath))
+    name = re.sub(r"[^\w.-]+", "_", request.node.name)
+    path = test_path.parent / SNAPSHOTS_DIR / test_path.stem / (name + ".json")
+    return SpecSnapshot(path, request.config.getoption("apispec_snapshot_update"))
+
+
+@pytest.fixture
+def apispec_budget():
+    """Returns :class:`SpecBudget` class to measure spec build with"""
+    return SpecBudget
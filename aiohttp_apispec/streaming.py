@@ -0,0 +1,72 @@
+import asyncio
+import json
+
+from aiohttp import web
+
+# nesting levels of spec members encoded item by item
+SPLIT_DEPTHS = {"paths": 1, "definitions": 1, "components": 2}
+
+
+class SpecStream:
+    """
+    Writes spec to chunked response encoding it path by path
+    and schema by schema.
+
+    The first response encodes spec between writes, so other requests are
+    not blocked by encoding of the whole document. Encoded document is kept
+    and written as is to next responses.
+
+    :param dict spec: spec dict
+    :param dumps: function to encode parts of spec into JSON string
+    """
+
+    def __init__(self, spec, dumps=json.dumps):
+        self.spec = spec
+        self.dumps = dumps
+        self._body = None
+
+    def iter_chunks(self):
+        """Yields encoded spec, one chunk per path, component and other member"""
+        buffer = []
+        for text, is_value in self._iter_parts(self.spec, 1, SPLIT_DEPTHS):
+            buffer.append(text)
+            if is_value:
+                yield "".join(buffer).encode("utf-8")
+                buffer = []
+        yield "".join(buffer).encode("utf-8")
+
+    def _iter_parts(self, value, depth, depths=None):
+        # yields (text, is_value) pairs, punctuation is joined with next value,
+        # dicts are opened up to depth levels or by depths of their keys
+        if not depth or not isinstance(value, dict):
+            yield self.dumps(value), True
+            return
+        yield "{", False
+        separator = ""
+        for key, item in value.items():
+            yield "{}{}: ".format(separator, self.dumps(key)), False
+            yield from self._iter_parts(
+                item, depths.get(key, 0) if depths else depth - 1
+            )
+            separator = ", "
+        yield "}", False
+
+    async def write(self, response: web.StreamResponse):
+        if self._body is not None:
+            await response.write(self._body)
+            return
+        chunks = []
+        for chunk in self.iter_chunks():
+            chunks.append(chunk)
+            await response.write(chunk)
+            # let other tasks run between encoding of paths and components
+            await asyncio.sleep(0)
+        self._body = b"".join(chunks)
+
+    async def response(self, request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        await self.write(response)
+        await response.write_eof()
+        return response
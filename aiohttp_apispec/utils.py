@@ -1,15 +1,163 @@
 from string import Formatter
+from typing import Dict, NamedTuple, Optional, Tuple
+from weakref import WeakKeyDictionary
 
+from marshmallow import fields
 
-def get_path(route):
-    path_info = route.resource.get_info()
-    return path_info.get("path") or path_info.get("formatter")
+# default regex aiohttp uses for a ``{name}`` placeholder without constraint
+DEFAULT_PATH_KEY_PATTERN = r"[^{}/]+"
+
+_route_paths = WeakKeyDictionary()
+
+
+class RoutePath(NamedTuple):
+    """Parsed path of an aiohttp resource"""
+
+    template: str
+    keys: Tuple[str, ...]
+    patterns: Dict[str, str]
 
 
 def get_path_keys(path):
     return [i[1] for i in Formatter().parse(path) if i[1]]
 
 
+def get_route_path(route) -> Optional[RoutePath]:
+    """
+    Returns parsed path of the route's resource or None
+    if the resource has no path (static files, sub applications etc).
+
+    Result is computed once per resource and shared by all its routes.
+    """
+    resource = route.resource
+    if resource is None:
+        return None
+    try:
+        return _route_paths[resource]
+    except KeyError:
+        pass
+    route_path = _parse_resource(resource)
+    _route_paths[resource] = route_path
+    return route_path
+
+
+def _parse_resource(resource) -> Optional[RoutePath]:
+    path_info = resource.get_info()
+    if path_info.get("path"):
+        return RoutePath(path_info["path"], (), {})
+    template = path_info.get("formatter")
+    if not template:
+        return None
+    keys = tuple(get_path_keys(template))
+    pattern = path_info.get("pattern")
+    patterns = {}
+    if pattern is not None:
+        for key in keys:
+            regex = _extract_group(pattern.pattern, key)
+            if regex and regex != DEFAULT_PATH_KEY_PATTERN:
+                # aiohttp matches the whole placeholder,
+                # while OpenAPI pattern matches anywhere in the value
+                patterns[key] = "^(?:{})$".format(regex)
+    return RoutePath(template, keys, patterns)
+
+
+def _extract_group(pattern: str, name: str) -> Optional[str]:
+    """Returns body of the ``(?P<name>...)`` group of the regex pattern"""
+    start = pattern.find("(?P<{}>".format(name))
+    if start < 0:
+        return None
+    start += len(name) + 5
+    depth = 1
+    in_class = False
+    i = start
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+            # "]" right after "[" or "[^" is a literal
+            if pattern[i + 1 : i + 2] == "^":
+                i += 1
+            if pattern[i + 1 : i + 2] == "]":
+                i += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return pattern[start:i]
+        i += 1
+    return None
+
+
+def make_data_class(schema):
+    """
+    Returns a class with ``__slots__`` for every field the schema loads.
+
+    Instances are created with the keyword arguments produced by
+    ``schema.load``, fields absent from the loaded data are set to None.
+    """
+    slots = tuple(field.attribute or name for name, field in schema.load_fields.items())
+
+    def __init__(self, **kwargs):
+        for slot in slots:
+            setattr(self, slot, kwargs.pop(slot, None))
+        if kwargs:
+            raise TypeError(
+                "{}() got unexpected fields: {}".format(
+                    type(self).__name__, ", ".join(sorted(kwargs))
+                )
+            )
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in slots)
+
+    def __repr__(self):
+        return "{}({})".format(
+            type(self).__name__,
+            ", ".join("{}={!r}".format(slot, getattr(self, slot)) for slot in slots),
+        )
+
+    name = type(schema).__name__
+    if name.endswith("Schema"):
+        name = name[:-6] or name
+    return type(
+        name + "Data",
+        (),
+        {
+            "__slots__": slots,
+            "__init__": __init__,
+            "__eq__": __eq__,
+            "__hash__": None,
+            "__repr__": __repr__,
+        },
+    )
+
+
+def inner_fields(field):
+    """Yields fields of container field (List, Tuple, Dict)"""
+    for attr in ("inner", "key_field", "value_field"):
+        inner = getattr(field, attr, None)
+        if inner is not None:
+            yield inner
+    yield from getattr(field, "tuple_fields", ())
+
+
+def iter_nested_fields(field):
+    """Yields Nested fields of field itself and of its inner fields"""
+    if isinstance(field, fields.Nested):
+        yield field
+    for inner in inner_fields(field):
+        yield from iter_nested_fields(inner)
+
+
 def issubclass_py37fix(cls, cls_info):
     try:
         return issubclass(cls, cls_info)
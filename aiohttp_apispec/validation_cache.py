@@ -0,0 +1,70 @@
+from collections import OrderedDict
+
+# locations whose data is fully defined by request url
+CACHEABLE_LOCATIONS = ("querystring", "query", "match_info", "path")
+CACHEABLE_METHODS = ("GET", "HEAD")
+
+
+class ValidationCache:
+    """
+    Bounded LRU cache of validated query string and match info data
+    of GET requests, used by validation_middleware.
+
+    Only successfully validated data is cached, keyed by schema,
+    location and raw query string or match info. Views get a deep copy
+    of cached data.
+
+    :param int maxsize: max number of cached results
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    @staticmethod
+    def make_key(request, record):
+        """Returns cache key or None if record data can not be cached"""
+        if request.method not in CACHEABLE_METHODS:
+            return None
+        if record.location not in CACHEABLE_LOCATIONS or record.pool is not None:
+            return None
+        if record.location in ("querystring", "query"):
+            raw = request.rel_url.raw_query_string
+        else:
+            raw = tuple(request.match_info.items())
+        return record.schema, record.location, raw
+
+    def get(self, key):
+        try:
+            data = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        self._data[key] = data
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
@@ -0,0 +1,93 @@
+import json
+
+from aiohttp import WSMsgType, web
+from marshmallow import ValidationError
+
+from .utils import issubclass_py37fix
+
+INVALID_JSON_MESSAGE = "Invalid JSON message."
+
+
+class MessageValidator:
+    """
+    Validates JSON WebSocket frames with marshmallow schema instance
+    resolved once by :func:`ws_message_schema <aiohttp_apispec.ws_message_schema>`.
+
+    A frame with JSON array is a batch: its items are loaded with one
+    ``load(many=True)`` call (per schema of
+    :class:`DiscriminatorSchema <aiohttp_apispec.DiscriminatorSchema>`),
+    and the whole batch is rejected if any item is invalid
+    (errors are keyed by item index).
+
+    :param schema: schema instance
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+
+    def validate(self, raw):
+        """
+        Returns list of validated messages of ``str`` or ``bytes`` frame,
+        raises :class:`ValidationError <marshmallow.ValidationError>`
+        """
+        try:
+            data = json.loads(raw)
+        except ValueError:
+            raise ValidationError(INVALID_JSON_MESSAGE) from None
+        if isinstance(data, list):
+            return self.schema.load(data, many=True)
+        return [self.schema.load(data)]
+
+
+async def send_errors(ws: web.WebSocketResponse, error: ValidationError):
+    """Default error handler of :func:`ws_messages`, sends errors back as JSON"""
+    await ws.send_json({"errors": error.messages})
+
+
+async def ws_messages(
+    request: web.Request, ws: web.WebSocketResponse, on_error=send_errors
+):
+    """
+    Yields validated messages received by ``ws`` of view decorated with
+    :func:`ws_message_schema <aiohttp_apispec.ws_message_schema>`.
+
+    Usage:
+
+    .. code-block:: python
+
+        @ws_message_schema(MessageSchema)
+        async def handler(request):
+            ws = web.WebSocketResponse()
+            await ws.prepare(request)
+            async for message in ws_messages(request, ws):
+                ...
+            return ws
+
+    :param request: request of WebSocket view
+    :param ws: prepared WebSocket response
+    :param on_error: coroutine function called with ``ws`` and
+                     :class:`ValidationError <marshmallow.ValidationError>`
+                     for invalid frames, which are skipped.
+                     By default errors are sent back as ``{"errors": messages}``
+    """
+    validator = _get_validator(request)
+    async for msg in ws:
+        if msg.type not in (WSMsgType.TEXT, WSMsgType.BINARY):
+            continue
+        try:
+            messages = validator.validate(msg.data)
+        except ValidationError as error:
+            await on_error(ws, error)
+            continue
+        for message in messages:
+            yield message
+
+
+def _get_validator(request):
+    handler = request.match_info.handler
+    if issubclass_py37fix(handler, web.View):
+        handler = getattr(handler, request.method.lower(), None)
+    try:
+        return handler.__ws_validator__
+    except AttributeError:
+        raise RuntimeError("View is not decorated with `ws_message_schema`") from None
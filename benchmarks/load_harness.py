@@ -0,0 +1,260 @@
+"""
+Load harness for validation_middleware.
+
+Starts aiohttp test server with handlers decorated by aiohttp_apispec
+decorators and drives it with concurrent client requests. For every
+scenario, payload size and middleware setting it reports throughput,
+p50/p99 latency and event loop lag as JSON, so results can be compared
+across versions::
+
+    python benchmarks/load_harness.py --requests 2000 --concurrency 50 \\
+        --output results.json
+
+Server and client share one event loop, so loop lag covers both of them.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+from marshmallow import EXCLUDE, Schema, fields
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from aiohttp_apispec import (  # noqa: E402
+    headers_schema,
+    json_schema,
+    match_info_schema,
+    querystring_schema,
+    response_schema,
+    setup_aiohttp_apispec,
+    validation_middleware,
+)
+
+
+class ItemSchema(Schema):
+    id = fields.Int(required=True)
+    name = fields.Str(required=True)
+    tags = fields.List(fields.Str())
+
+
+class PayloadSchema(Schema):
+    items = fields.List(fields.Nested(ItemSchema), required=True)
+
+
+class QuerySchema(Schema):
+    page = fields.Int()
+    ids = fields.List(fields.Int())
+
+
+class HeadersSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE
+
+    request_id = fields.Str(data_key="X-Request-ID", required=True)
+
+
+class MatchInfoSchema(Schema):
+    user_id = fields.Int(required=True)
+
+
+@json_schema(PayloadSchema)
+async def post_json(request):
+    return web.json_response({"count": len(request.get("json", {}).get("items", []))})
+
+
+@querystring_schema(QuerySchema)
+@headers_schema(HeadersSchema)
+async def get_query(request):
+    return web.json_response(request.get("querystring", {}))
+
+
+@match_info_schema(MatchInfoSchema)
+@json_schema(PayloadSchema)
+@response_schema(PayloadSchema, 200)
+async def put_user(request):
+    return web.json_response({"user_id": request.match_info["user_id"]})
+
+
+def make_payload(size):
+    return {
+        "items": [
+            {"id": i, "name": "item-{}".format(i), "tags": ["a", "b"]}
+            for i in range(size)
+        ]
+    }
+
+
+# name -> (method, path, route path, handler, request kwargs factory)
+SCENARIOS = {
+    "json": (
+        "POST",
+        "/items",
+        "/items",
+        post_json,
+        lambda size: {"json": make_payload(size)},
+    ),
+    "querystring+headers": (
+        "GET",
+        "/items",
+        "/items",
+        get_query,
+        lambda size: {
+            "params": [("page", "1")] + [("ids", str(i)) for i in range(size)],
+            "headers": {"X-Request-ID": "load-harness"},
+        },
+    ),
+    "match_info+json+response": (
+        "PUT",
+        "/users/{user_id}",
+        "/users/1",
+        put_user,
+        lambda size: {"json": make_payload(size)},
+    ),
+}
+
+
+def make_app(scenario, middleware, native_parser):
+    method, path, _, handler, _ = SCENARIOS[scenario]
+    app = web.Application(middlewares=[validation_middleware] if middleware else [])
+    app.router.add_route(method, path, handler)
+    setup_aiohttp_apispec(app, native_parser=native_parser)
+    return app
+
+
+def percentile(values, percent):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(percent / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def monitor_loop_lag(lags, interval=0.005):
+    loop = asyncio.get_event_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - started - interval))
+
+
+async def run_case(scenario, size, middleware, native_parser, requests, concurrency):
+    method, _, url, _, make_kwargs = SCENARIOS[scenario]
+    kwargs = make_kwargs(size)
+    server = TestServer(make_app(scenario, middleware, native_parser))
+    await server.start_server()
+    latencies = []
+    statuses = {}
+    lags = []
+    async with ClientSession() as session:
+        target = server.make_url(url)
+        # warm up connections and caches
+        for _ in range(min(concurrency, requests)):
+            async with session.request(method, target, **kwargs) as res:
+                await res.read()
+
+        queue = iter(range(requests))
+
+        async def worker():
+            for _ in queue:
+                started = time.perf_counter()
+                async with session.request(method, target, **kwargs) as res:
+                    await res.read()
+                latencies.append(time.perf_counter() - started)
+                statuses[res.status] = statuses.get(res.status, 0) + 1
+
+        monitor = asyncio.ensure_future(monitor_loop_lag(lags))
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        monitor.cancel()
+    await server.close()
+    return {
+        "scenario": scenario,
+        "payload_size": size,
+        "middleware": middleware,
+        "native_parser": native_parser,
+        "requests": requests,
+        "concurrency": concurrency,
+        "statuses": {str(status): count for status, count in statuses.items()},
+        "throughput_rps": requests / elapsed,
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": max(latencies) * 1000,
+        },
+        "loop_lag_ms": {
+            "p50": (percentile(lags, 50) or 0.0) * 1000,
+            "p99": (percentile(lags, 99) or 0.0) * 1000,
+            "max": max(lags, default=0.0) * 1000,
+        },
+    }
+
+
+def versions():
+    result = {"python": platform.python_version()}
+    for name in ("aiohttp", "aiohttp-apispec", "apispec", "marshmallow", "webargs"):
+        try:
+            from importlib.metadata import version
+
+            result[name] = version(name)
+        except Exception:
+            result[name] = None
+    return result
+
+
+async def run(args):
+    results = []
+    for scenario in args.scenarios:
+        for size in args.sizes:
+            for middleware in (False, True):
+                result = await run_case(
+                    scenario,
+                    size,
+                    middleware,
+                    args.native_parser,
+                    args.requests,
+                    args.concurrency,
+                )
+                results.append(result)
+                print(
+                    "{scenario} size={payload_size} middleware={middleware}: "
+                    "{throughput_rps:.0f} rps, p99 {p99:.2f} ms".format(
+                        p99=result["latency_ms"]["p99"], **result
+                    ),
+                    file=sys.stderr,
+                )
+    return {"versions": versions(), "results": results}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument(
+        "--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--native-parser", action="store_true")
+    parser.add_argument("--output", help="file for JSON results, stdout by default")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.get_event_loop().run_until_complete(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -34,4 +34,7 @@ setup(
         'Programming Language :: Python :: 3.8',
     ],
     test_suite='tests',
+    entry_points={
+        'pytest11': ['aiohttp_apispec.pytest_plugin = aiohttp_apispec.pytest_plugin'],
+    },
 )
@@ -15,6 +15,8 @@ from aiohttp_apispec import (
     validation_middleware,
 )
 
+pytest_plugins = "pytester"
+
 
 class HeaderSchema(Schema):
     class Meta:
@@ -75,18 +77,38 @@ def example_for_request_schema():
     }
 
 
+@pytest.fixture
+def make_client(aiohttp_client):
+    """
+    Returns coroutine function creating test client of app with
+    validation_middleware (after ``middlewares``) and ``routes``
+    like ``{"POST /items": handler}``. Other keyword arguments
+    are passed to ``setup_aiohttp_apispec``.
+    """
+
+    async def make_client(routes, middlewares=(), **kwargs):
+        app = web.Application(middlewares=[*middlewares, validation_middleware])
+        setup_aiohttp_apispec(app, **kwargs)
+        for route, handler in routes.items():
+            method, path = route.split(" ")
+            app.router.add_route(method, path, handler)
+        return await aiohttp_client(app)
+
+    return make_client
+
+
 @pytest.fixture(
     # since multiple locations are no longer supported
     # in a single call, location should always expect string
     params=[
-        ({"location": "querystring"}, True),
-        ({"location": "querystring"}, True),
-        ({"location": "querystring"}, False),
-        ({"location": "querystring"}, False),
+        ({"location": "querystring"}, True, False),
+        ({"location": "querystring"}, True, True),
+        ({"location": "querystring"}, False, False),
+        ({"location": "querystring"}, False, True),
     ]
 )
 def aiohttp_app(loop, aiohttp_client, request, example_for_request_schema):
-    location, nested = request.param
+    location, nested, native_parser = request.param
 
     @docs(
         tags=["mytag"],
@@ -191,6 +213,7 @@ def aiohttp_app(loop, aiohttp_client, request, example_for_request_schema):
             url="/api/docs/api-docs",
             swagger_path="/api/docs",
             error_callback=my_error_handler,
+            native_parser=native_parser,
         )
         v1.router.add_routes(
             [
@@ -216,6 +239,7 @@ def aiohttp_app(loop, aiohttp_client, request, example_for_request_schema):
             url="/v1/api/docs/api-docs",
             swagger_path="/v1/api/docs",
             error_callback=my_error_handler,
+            native_parser=native_parser,
         )
         app.router.add_routes(
             [
@@ -1,8 +1,9 @@
 import pytest
 from aiohttp import web
-from marshmallow import Schema, fields
+from marshmallow import INCLUDE, Schema, fields, post_load
 
 from aiohttp_apispec import docs, request_schema, response_schema
+from aiohttp_apispec.decorators.request import SchemaRecord
 
 
 class RequestSchema(Schema):
@@ -91,12 +92,12 @@ class TestViewDecorators:
     def test_request_schema_view(self, aiohttp_view_kwargs):
         assert hasattr(aiohttp_view_kwargs, "__apispec__")
         assert hasattr(aiohttp_view_kwargs, "__schemas__")
-        assert isinstance(
-            aiohttp_view_kwargs.__schemas__[0].pop("schema"), RequestSchema
+        record = aiohttp_view_kwargs.__schemas__[0]
+        assert isinstance(record.schema, RequestSchema)
+        assert record._replace(schema=None) == SchemaRecord(
+            schema=None, location="querystring"
         )
-        assert aiohttp_view_kwargs.__schemas__ == [
-            {"location": "querystring", 'put_into': None}
-        ]
+        assert aiohttp_view_kwargs.__apispec__["schemas"] == [record]
         for param in ("parameters", "responses"):
             assert param in aiohttp_view_kwargs.__apispec__
 
@@ -143,17 +144,15 @@ class TestViewDecorators:
         schema = aiohttp_view_request_schema_with_example_without_refs.__apispec__[
             "schemas"
         ][0]
-        expacted_result = example_for_request_schema.copy()
-        expacted_result['add_to_refs'] = False
-        assert schema['example'] == expacted_result
+        assert schema.example == example_for_request_schema
+        assert schema.add_to_refs is False
 
     def test_request_schema_with_example(
         self, aiohttp_view_request_schema_with_example, example_for_request_schema
     ):
         schema = aiohttp_view_request_schema_with_example.__apispec__["schemas"][0]
-        expacted_result = example_for_request_schema.copy()
-        expacted_result['add_to_refs'] = True
-        assert schema['example'] == expacted_result
+        assert schema.example == example_for_request_schema
+        assert schema.add_to_refs is True
 
     def test_all(self, aiohttp_view_all):
         assert hasattr(aiohttp_view_all, "__apispec__")
@@ -174,3 +173,27 @@ class TestViewDecorators:
 
         assert isinstance(ex.value, RuntimeError)
         assert str(ex.value) == "Multiple json locations are not allowed"
+
+    def test_data_class_unsupported(self):
+        class ObjectSchema(RequestSchema):
+            @post_load
+            def make_object(self, data, **kwargs):
+                return object()
+
+        with pytest.raises(ValueError, match="post_load"):
+            request_schema(ObjectSchema, data_class=True)
+        with pytest.raises(ValueError, match="files"):
+            request_schema(RequestSchema, location="files", data_class=True)
+
+    @pytest.mark.parametrize(
+        "schema",
+        [
+            RequestSchema(unknown=INCLUDE),
+            Schema.from_dict({"id": fields.Int(attribute="item.id")})(),
+        ],
+    )
+    def test_generated_data_class_unsupported(self, schema):
+        with pytest.raises(ValueError, match="data_class=True"):
+            request_schema(schema, data_class=True)
+        # own class decides what to do with such data
+        request_schema(schema, data_class=dict)
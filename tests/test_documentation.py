@@ -1,10 +1,25 @@
 import json
 
+import pytest
 from aiohttp import web
 from aiohttp.web_urldispatcher import StaticResource
+from apispec.ext.marshmallow.openapi import OpenAPIConverter
+from marshmallow import Schema, fields, validate
 from yarl import URL
 
-from aiohttp_apispec import setup_aiohttp_apispec
+from aiohttp_apispec import (
+    AiohttpApiSpec,
+    docs,
+    form_schema,
+    querystring_schema,
+    request_schema,
+    response_schema,
+    setup_aiohttp_apispec,
+    validation_middleware,
+    ws_message_schema,
+)
+from aiohttp_apispec.cache import fingerprint
+from aiohttp_apispec.streaming import SpecStream
 
 
 def test_app_swagger_url(aiohttp_app):
@@ -191,3 +206,634 @@ async def test_register_route_for_relative_url():
     routes_count_after_setup_apispec = len(app.router.routes())
     # not sure why there was a comparison between the old rount_count vs new_route_count
     assert routes_count_after_setup_apispec == 1
+
+
+async def test_profile_report(aiohttp_client):
+    class ItemSchema(Schema):
+        id = fields.Int()
+
+    @request_schema(ItemSchema)
+    @response_schema(ItemSchema, 200)
+    async def handler(request):
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_post("/items", handler)
+    apispec = setup_aiohttp_apispec(app, profile_path="/api/docs/profile")
+    client = await aiohttp_client(app)
+
+    report = apispec.profile_report()
+    assert [(r["method"], r["path"]) for r in report["routes"]] == [("post", "/items")]
+    assert set(report["routes"][0]["stages"]) == {
+        "schema2parameters",
+        "add_examples",
+        "deepcopy",
+        "spec.path",
+    }
+    assert report["schemas"][0]["schema"].endswith("ItemSchema")
+    assert report["schemas"][0]["calls"] == 2
+    assert [c["name"] for c in report["components"]] == ["Item"]
+
+    res = await client.get("/api/docs/profile", params={"limit": 1})
+    assert res.status == 200
+    assert (await res.json())["schemas"] == report["schemas"]
+
+    for limit in ("x", "-1"):
+        res = await client.get("/api/docs/profile", params={"limit": limit})
+        assert res.status == 400
+
+
+def test_profile_report_disabled():
+    apispec = AiohttpApiSpec(title="API", version="0.0.1")
+    with pytest.raises(RuntimeError):
+        apispec.profile_report()
+
+
+def test_spec_cache(tmp_path, monkeypatch):
+    class ItemSchema(Schema):
+        id = fields.Int()
+
+    def make_app(schema):
+        @request_schema(schema)
+        async def handler(request):
+            return web.json_response({})
+
+        app = web.Application()
+        app.router.add_post("/items", handler)
+        return app
+
+    apispec = setup_aiohttp_apispec(
+        make_app(ItemSchema), in_place=True, cache_dir=str(tmp_path)
+    )
+    spec = apispec.swagger_dict()
+    assert len(list(tmp_path.iterdir())) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("spec should be loaded from cache")
+
+    monkeypatch.setattr(AiohttpApiSpec, "_register_route", fail)
+    app = make_app(ItemSchema)
+    setup_aiohttp_apispec(app, in_place=True, cache_dir=str(tmp_path))
+    assert app["swagger_dict"] == spec
+
+    class OtherItemSchema(Schema):
+        id = fields.Str()
+
+    monkeypatch.undo()
+    setup_aiohttp_apispec(
+        make_app(OtherItemSchema), in_place=True, cache_dir=str(tmp_path)
+    )
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+class NestedItemSchema(Schema):
+    id = fields.Int()
+    name = fields.Str()
+
+
+@pytest.mark.parametrize(
+    "field, other",
+    [
+        (fields.Nested(NestedItemSchema), fields.Nested(NestedItemSchema, many=True)),
+        (
+            fields.Nested(NestedItemSchema),
+            fields.Nested(NestedItemSchema, only=("id",)),
+        ),
+        (
+            fields.Nested(NestedItemSchema),
+            fields.Nested(NestedItemSchema, exclude=("id",)),
+        ),
+        (fields.Dict(values=fields.Int()), fields.Dict(values=fields.Str())),
+        (
+            fields.Tuple((fields.Int(), fields.Int())),
+            fields.Tuple((fields.Int(), fields.Str())),
+        ),
+        (
+            fields.Pluck(NestedItemSchema, "id"),
+            fields.Pluck(NestedItemSchema, "name"),
+        ),
+        (
+            fields.Int(validate=validate.Range(min=1)),
+            fields.Int(validate=validate.Range(min=2)),
+        ),
+        (fields.TimeDelta(), fields.TimeDelta(precision="days")),
+    ],
+)
+def test_spec_cache_fingerprint(field, other):
+    def entries(item_field):
+        schema_cls = Schema.from_dict({"item": item_field})
+
+        @request_schema(schema_cls)
+        async def handler(request):
+            return web.json_response({})
+
+        return [("POST", "/items", handler)]
+
+    assert fingerprint(entries(field), {}) == fingerprint(entries(field), {})
+    assert fingerprint(entries(field), {}) != fingerprint(entries(other), {})
+
+
+class FingerprintChildSchema(Schema):
+    class Meta:
+        title = "Child"
+
+    id = fields.Int()
+
+
+@pytest.mark.parametrize(
+    "nested",
+    [
+        "FingerprintChildSchema",
+        lambda: FingerprintChildSchema(),
+        FingerprintChildSchema,
+    ],
+)
+def test_spec_cache_fingerprint_nested_changes(nested, monkeypatch):
+    class ParentSchema(Schema):
+        child = fields.Nested(nested)
+
+    @request_schema(ParentSchema)
+    async def handler(request):
+        return web.json_response({})
+
+    entries = [("POST", "/items", handler)]
+    digest = fingerprint(entries, {})
+    monkeypatch.setitem(FingerprintChildSchema._declared_fields, "name", fields.Str())
+    changed_fields = fingerprint(entries, {})
+    monkeypatch.setattr(FingerprintChildSchema.Meta, "title", "Other")
+    changed_title = fingerprint(entries, {})
+    assert len({digest, changed_fields, changed_title}) == 3
+
+
+def test_spec_cache_nested_many(tmp_path):
+    def make_app(many):
+        class ItemSchema(Schema):
+            item = fields.Nested(NestedItemSchema, many=many)
+
+        @request_schema(ItemSchema)
+        async def handler(request):
+            return web.json_response({})
+
+        app = web.Application()
+        app.router.add_post("/items", handler)
+        return app
+
+    for many in (False, True):
+        app = make_app(many)
+        setup_aiohttp_apispec(app, in_place=True, cache_dir=str(tmp_path))
+        item = app["swagger_dict"]["definitions"]["Item"]["properties"]["item"]
+        assert ("items" in item) is many
+
+
+async def test_stream_spec(aiohttp_client):
+    class ItemSchema(Schema):
+        id = fields.Int()
+
+    @request_schema(ItemSchema)
+    async def handler(request):
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_post("/items", handler)
+    app.router.add_get("/items/{id}", handler)
+    setup_aiohttp_apispec(app, stream_spec=True)
+    client = await aiohttp_client(app)
+
+    for _ in range(2):
+        res = await client.get("/api/docs/swagger.json")
+        assert res.status == 200
+        assert res.headers["Transfer-Encoding"] == "chunked"
+        assert await res.json() == client.app["swagger_dict"]
+
+
+@pytest.mark.parametrize("openapi_version", ["2.0", "3.0.0"])
+def test_stream_spec_chunks(openapi_version):
+    class ItemSchema(Schema):
+        id = fields.Int()
+
+    class UserSchema(Schema):
+        name = fields.Str()
+
+    @request_schema(ItemSchema)
+    @response_schema(UserSchema, 200)
+    async def handler(request):
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_post("/items", handler)
+    spec = setup_aiohttp_apispec(
+        app, in_place=True, openapi_version=openapi_version
+    ).swagger_dict()
+    chunks = list(SpecStream(spec).iter_chunks())
+
+    assert json.loads(b"".join(chunks)) == spec
+    schemas = spec.get("definitions") or spec["components"]["schemas"]
+    for name in ("Item", "User"):
+        encoded = '"{}": {}'.format(name, json.dumps(schemas[name])).encode()
+        assert sum(chunk.endswith(encoded) for chunk in chunks) == 1
+        assert sum(encoded in chunk for chunk in chunks) == 1
+
+
+def test_view_shared_by_apps():
+    class ItemSchema(Schema):
+        id = fields.Int()
+
+    @request_schema(ItemSchema, example={"id": 1})
+    @response_schema(ItemSchema, 200)
+    async def handler(request):
+        return web.json_response({})
+
+    specs = []
+    for _ in range(2):
+        app = web.Application()
+        app.router.add_post("/items/{id}", handler)
+        specs.append(setup_aiohttp_apispec(app, in_place=True).swagger_dict())
+    assert specs[0] == specs[1]
+    assert handler.__apispec__["parameters"] == []
+
+
+async def test_release_docs(aiohttp_client):
+    class ItemSchema(Schema):
+        id = fields.Int()
+
+    @docs(summary="Create item")
+    @request_schema(ItemSchema, example={"id": 1})
+    @response_schema(ItemSchema, 200)
+    async def handler(request):
+        return web.json_response(request["data"])
+
+    app = web.Application(middlewares=[validation_middleware])
+    app.router.add_post("/items", handler)
+    setup_aiohttp_apispec(app, release_docs=True)
+    client = await aiohttp_client(app)
+
+    assert handler.__apispec__ == {}
+    assert handler.__schemas__[0].example is None
+    spec = client.app["swagger_dict"]["paths"]["/items"]["post"]
+    assert spec["summary"] == "Create item"
+    res = await client.post("/items", json={"id": 1})
+    assert await res.json() == {"id": 1}
+
+
+@pytest.mark.parametrize("openapi_version", ["2.0", "3.0.0"])
+def test_build_workers(openapi_version):
+    class ItemSchema(Schema):
+        id = fields.Int()
+
+    class ItemsSchema(Schema):
+        items = fields.List(fields.Nested(ItemSchema))
+        tags = fields.List(fields.Str())
+
+    def make_app():
+        app = web.Application()
+        for i in range(20):
+
+            @docs(summary=str(i))
+            @request_schema(ItemsSchema if i % 2 else ItemSchema)
+            @response_schema(ItemsSchema, 200)
+            async def handler(request):
+                return web.json_response({})
+
+            method = "GET" if i % 2 else "POST"
+            app.router.add_route(method, "/items/{}/{{id}}".format(i // 2), handler)
+        return app
+
+    serial = setup_aiohttp_apispec(
+        make_app(), in_place=True, openapi_version=openapi_version
+    )
+    parallel = setup_aiohttp_apispec(
+        make_app(), in_place=True, openapi_version=openapi_version, build_workers=3
+    )
+    assert json.dumps(parallel.swagger_dict()) == json.dumps(serial.swagger_dict())
+
+
+def make_item_schema_a():
+    class ItemSchema(Schema):
+        id = fields.Int()
+
+    return ItemSchema
+
+
+def make_item_schema_b():
+    class ItemSchema(Schema):
+        name = fields.Str()
+
+    return ItemSchema
+
+
+@pytest.mark.parametrize("build_workers", [None, 2])
+@pytest.mark.parametrize("reverse", [False, True])
+def test_schema_name_collision(build_workers, reverse):
+    schemas = [make_item_schema_a(), make_item_schema_b()]
+    app = web.Application()
+    for i, schema in enumerate(reversed(schemas) if reverse else schemas):
+
+        @request_schema(schema)
+        async def handler(request):
+            return web.json_response({})
+
+        app.router.add_post("/items/{}".format(i), handler)
+
+    spec = setup_aiohttp_apispec(app, in_place=True, build_workers=build_workers)
+    definitions = spec.swagger_dict()["definitions"]
+    # names are ordered by schema class paths, not by routes
+    assert definitions["Item"]["properties"] == {"id": {"type": "integer"}}
+    assert definitions["Item1"]["properties"] == {"name": {"type": "string"}}
+
+
+def test_schema_name_resolver_called_once():
+    calls = []
+
+    def schema_name_resolver(schema):
+        calls.append(type(schema).__name__)
+        return type(schema).__name__
+
+    class ItemSchema(Schema):
+        id = fields.Int()
+
+    class ItemsSchema(Schema):
+        items = fields.List(fields.Nested(ItemSchema))
+
+    app = web.Application()
+    for i in range(5):
+
+        @request_schema(ItemsSchema, example={"items": []}, add_to_refs=True)
+        @response_schema(ItemSchema, 200)
+        async def handler(request):
+            return web.json_response({})
+
+        app.router.add_post("/items/{}".format(i), handler)
+
+    setup_aiohttp_apispec(app, in_place=True, schema_name_resolver=schema_name_resolver)
+    assert sorted(calls) == ["ItemSchema", "ItemsSchema"]
+
+
+async def test_swagger2_url(aiohttp_client):
+    class NestedSchema(Schema):
+        i = fields.Int(allow_none=True)
+
+    class ItemSchema(Schema):
+        id = fields.Int(required=True, metadata={"description": "id"})
+        name = fields.Str(load_only=True)
+        tags = fields.List(fields.Str())
+        ids = fields.List(fields.Int(), metadata={"explode": False})
+        nested = fields.Nested(NestedSchema)
+
+    def make_app():
+        @docs(tags=["items"], summary="Create item")
+        @request_schema(ItemSchema, example={"id": 1})
+        @response_schema(ItemSchema, 200, description="Created")
+        async def create(request):
+            return web.json_response({})
+
+        @querystring_schema(ItemSchema)
+        @form_schema(NestedSchema)
+        @response_schema(NestedSchema(many=True), 200)
+        async def search(request):
+            return web.json_response({})
+
+        app = web.Application()
+        app.router.add_post("/items/{id}", create)
+        app.router.add_get("/items", search)
+        return app
+
+    swagger2 = setup_aiohttp_apispec(
+        make_app(), in_place=True, native_parser=True
+    ).swagger_dict()
+    assert {"collectionFormat": "csv"}.items() <= next(
+        p
+        for p in swagger2["paths"]["/items"]["get"]["parameters"]
+        if p["name"] == "ids"
+    ).items()
+    app = make_app()
+    setup_aiohttp_apispec(
+        app,
+        native_parser=True,
+        url="/api/docs/openapi.json",
+        swagger2_url="/api/docs/swagger.json",
+        openapi_version="3.0.3",
+    )
+    client = await aiohttp_client(app)
+
+    res = await client.get("/api/docs/openapi.json")
+    assert (await res.json())["openapi"] == "3.0.3"
+    res = await client.get("/api/docs/swagger.json")
+    assert await res.json() == swagger2
+
+
+def test_swagger2_url_requires_openapi_3():
+    with pytest.raises(ValueError):
+        setup_aiohttp_apispec(web.Application(), swagger2_url="/swagger.json")
+
+
+@pytest.mark.parametrize("openapi_version", ["2.0", "3.0.0"])
+def test_ws_message_schema(openapi_version):
+    class PingSchema(Schema):
+        type = fields.Str(required=True)
+
+    class SubscribeSchema(Schema):
+        type = fields.Str(required=True)
+        channel = fields.Str(required=True)
+
+    @ws_message_schema(
+        {"ping": PingSchema, "subscribe": SubscribeSchema}, discriminator="type"
+    )
+    async def feed(request):
+        return web.WebSocketResponse()
+
+    @ws_message_schema(PingSchema)
+    async def ping(request):
+        return web.WebSocketResponse()
+
+    app = web.Application()
+    app.router.add_get("/feed", feed)
+    app.router.add_get("/ping", ping)
+    spec = setup_aiohttp_apispec(
+        app, in_place=True, openapi_version=openapi_version
+    ).swagger_dict()
+
+    prefix = "#/definitions/" if openapi_version == "2.0" else "#/components/schemas/"
+    schemas = spec.get("definitions") or spec["components"]["schemas"]
+    assert set(schemas) == {"Ping", "Subscribe"}
+    keys = (
+        ("x-oneOf", "x-discriminator")
+        if openapi_version == "2.0"
+        else ("oneOf", "discriminator")
+    )
+    assert spec["paths"]["/feed"]["get"]["x-websocket-messages"] == {
+        keys[0]: [{"$ref": prefix + "Ping"}, {"$ref": prefix + "Subscribe"}],
+        keys[1]: {
+            "propertyName": "type",
+            "mapping": {"ping": prefix + "Ping", "subscribe": prefix + "Subscribe"},
+        },
+    }
+    assert spec["paths"]["/ping"]["get"]["x-websocket-messages"] == {
+        "$ref": prefix + "Ping"
+    }
+
+
+def test_ws_message_schema_mapping_requires_discriminator():
+    class PingSchema(Schema):
+        type = fields.Str()
+
+    with pytest.raises(ValueError):
+        ws_message_schema({"ping": PingSchema})
+
+
+@pytest.mark.parametrize("openapi_version", ["2.0", "3.0.0"])
+def test_request_schema_discriminator(openapi_version):
+    class CatSchema(Schema):
+        kind = fields.Str(required=True)
+        lives = fields.Int()
+
+    class DogSchema(Schema):
+        kind = fields.Str(required=True)
+        breed = fields.Str()
+
+    @request_schema(
+        {"cat": CatSchema, "dog": DogSchema},
+        discriminator="kind",
+        example={"kind": "cat"},
+    )
+    async def handler(request):
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_post("/pets", handler)
+    spec = setup_aiohttp_apispec(
+        app, in_place=True, openapi_version=openapi_version
+    ).swagger_dict()
+
+    prefix = "#/definitions/" if openapi_version == "2.0" else "#/components/schemas/"
+    keys = ("oneOf", "discriminator")
+    if openapi_version == "2.0":
+        keys = ("x-oneOf", "x-discriminator")
+    schemas = spec.get("definitions") or spec["components"]["schemas"]
+    assert set(schemas) == {"Cat", "Dog"}
+    assert spec["paths"]["/pets"]["post"]["parameters"] == [
+        {
+            "in": "body",
+            "required": False,
+            "name": "body",
+            "schema": {
+                keys[0]: [{"$ref": prefix + "Cat"}, {"$ref": prefix + "Dog"}],
+                keys[1]: {
+                    "propertyName": "kind",
+                    "mapping": {"cat": prefix + "Cat", "dog": prefix + "Dog"},
+                },
+                "example": {"kind": "cat"},
+            },
+        }
+    ]
+
+
+def test_request_schema_discriminator_errors():
+    class CatSchema(Schema):
+        kind = fields.Str()
+
+    with pytest.raises(ValueError):
+        request_schema({"cat": CatSchema})
+    with pytest.raises(ValueError):
+        querystring_schema({"cat": CatSchema}, discriminator="kind")
+
+
+@pytest.mark.parametrize("openapi_version", ["2.0", "3.0.0"])
+async def test_generate_examples(aiohttp_client, openapi_version):
+    class TagSchema(Schema):
+        name = fields.Str(data_key="tagName")
+
+    class ItemSchema(Schema):
+        id = fields.Int(validate=validate.Range(min=1))
+        tags = fields.List(fields.Nested(TagSchema))
+
+    class ErrorSchema(Schema):
+        message = fields.Str()
+
+    @request_schema(ItemSchema)
+    @response_schema(ErrorSchema, 400)
+    async def create(request):
+        return web.json_response({})
+
+    @request_schema(ErrorSchema, example={"message": "oops"}, add_to_refs=True)
+    async def report(request):
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_post("/items", create)
+    app.router.add_post("/errors", report)
+    spec = setup_aiohttp_apispec(
+        app,
+        generate_examples=True,
+        examples_url="/api/docs/examples.json",
+        openapi_version=openapi_version,
+    )
+    client = await aiohttp_client(app)
+
+    res = await client.get("/api/docs/examples.json")
+    examples = {
+        "Item": {"id": 1, "tags": [{"tagName": "string"}]},
+        "Tag": {"tagName": "string"},
+        "Error": {"message": "oops"},
+    }
+    assert await res.json() == examples
+    schemas = (
+        spec.swagger_dict().get("definitions")
+        or spec.swagger_dict()["components"]["schemas"]
+    )
+    assert {name: schema["example"] for name, schema in schemas.items()} == examples
+
+
+def test_inline_recursive_schemas(monkeypatch):
+    conversions = []
+    fields2jsonschema = OpenAPIConverter.fields2jsonschema
+
+    def count(self, fields_, **kwargs):
+        conversions.append(sorted(fields_))
+        return fields2jsonschema(self, fields_, **kwargs)
+
+    monkeypatch.setattr(OpenAPIConverter, "fields2jsonschema", count)
+
+    class LeafSchema(Schema):
+        value = fields.Int()
+
+    class TreeSchema(Schema):
+        leaf = fields.Nested(LeafSchema)
+        leaves = fields.Nested(LeafSchema, many=True)
+        children = fields.List(fields.Nested(lambda: TreeSchema()))
+
+    class QuerySchema(Schema):
+        leaf = fields.Nested(LeafSchema)
+
+    app = web.Application()
+    for i in range(3):
+
+        @request_schema(TreeSchema)
+        @querystring_schema(QuerySchema)
+        async def handler(request):
+            return web.json_response({})
+
+        app.router.add_post("/trees/{}".format(i), handler)
+
+    spec = setup_aiohttp_apispec(
+        app, in_place=True, schema_name_resolver=lambda schema: None
+    ).swagger_dict()
+
+    leaf = {"type": "object", "properties": {"value": {"type": "integer"}}}
+    assert spec["definitions"] == {
+        "Tree": {
+            "type": "object",
+            "properties": {
+                "leaf": leaf,
+                "leaves": {"type": "array", "items": leaf},
+                "children": {
+                    "type": "array",
+                    "items": {"$ref": "#/definitions/Tree"},
+                },
+            },
+        }
+    }
+    for i in range(3):
+        parameters = spec["paths"]["/trees/{}".format(i)]["post"]["parameters"]
+        assert parameters[1]["schema"] == {"$ref": "#/definitions/Tree"}
+    # every schema is converted once
+    assert sorted(conversions) == [["children", "leaf", "leaves"], ["value"]]
@@ -0,0 +1,56 @@
+import datetime
+import enum
+
+from marshmallow import Schema, fields, validate
+
+from aiohttp_apispec import generate_example
+
+
+class Color(enum.Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class TagSchema(Schema):
+    name = fields.Str(validate=validate.Length(min=10))
+    parent = fields.Nested(lambda: TagSchema())
+
+
+class ItemSchema(Schema):
+    id = fields.Int(data_key="itemId", validate=validate.Range(min=1, max=10))
+    price = fields.Float(validate=validate.Range(min=0, min_inclusive=False))
+    code = fields.Str(validate=validate.Length(equal=3))
+    status = fields.Str(validate=validate.OneOf(["new", "done"]))
+    color = fields.Enum(Color, by_value=True)
+    email = fields.Email()
+    created = fields.Date(load_default=datetime.date(2021, 2, 3))
+    note = fields.Str(metadata={"example": "fragile"})
+    tags = fields.List(fields.Nested(TagSchema), validate=validate.Length(min=2))
+    tag_names = fields.Pluck(TagSchema, "name", many=True)
+
+
+def test_generate_example():
+    assert generate_example(ItemSchema) == {
+        "itemId": 1,
+        "price": 1.0,
+        "code": "str",
+        "status": "new",
+        "color": "red",
+        "email": "user@example.com",
+        "created": "2021-02-03",
+        "note": "fragile",
+        "tags": [{"name": "stringstri"}, {"name": "stringstri"}],
+        "tag_names": ["stringstri"],
+    }
+
+
+def test_generate_example_modifiers():
+    assert generate_example(ItemSchema(only=("id",), many=True)) == [{"itemId": 1}]
+
+
+def test_generate_example_memo():
+    memo = {}
+    example = generate_example(ItemSchema, memo)
+    example["tags"][0]["name"] = "changed"
+    assert generate_example(ItemSchema, memo)["tags"][0]["name"] == "stringstri"
+    assert len(memo) == 2
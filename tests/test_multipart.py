@@ -0,0 +1,136 @@
+import pytest
+from aiohttp import FormData, web
+from marshmallow import Schema, fields
+
+from aiohttp_apispec import files_schema, form_schema
+
+
+class FormSchema(Schema):
+    title = fields.Str(required=True)
+    tags = fields.List(fields.Str())
+
+
+class FilesSchema(Schema):
+    image = fields.Raw(
+        required=True,
+        metadata={"type": "file", "max_size": 10, "content_types": ["image/*"]},
+    )
+    attachment = fields.Raw(metadata={"type": "file"})
+
+
+@form_schema(FormSchema)
+@files_schema(FilesSchema)
+async def upload(request):
+    sizes = {}
+    async for uploaded in request["files"]:
+        async for chunk in uploaded:
+            sizes[uploaded.name] = sizes.get(uploaded.name, 0) + len(chunk)
+    return web.json_response({"form": request["form"], "sizes": sizes})
+
+
+@pytest.fixture
+def client(loop, make_client):
+    return loop.run_until_complete(make_client({"POST /upload": upload}))
+
+
+def make_form(image=b"12345", content_type="image/png", title="cat"):
+    form = FormData()
+    if title is not None:
+        form.add_field("title", title)
+    form.add_field("tags", "a")
+    form.add_field("tags", "b")
+    if image is not None:
+        form.add_field("image", image, filename="cat.png", content_type=content_type)
+    form.add_field("attachment", b"x" * 100, filename="a.txt")
+    return form
+
+
+async def test_upload(client):
+    res = await client.post("/upload", data=make_form())
+    assert res.status == 200
+    assert await res.json() == {
+        "form": {"title": "cat", "tags": ["a", "b"]},
+        "sizes": {"image": 5, "attachment": 100},
+    }
+
+
+async def test_upload_form_error(client):
+    res = await client.post("/upload", data=make_form(title=None))
+    assert res.status == 422
+    assert await res.json() == {"form": {"title": ["Missing data for required field."]}}
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    [
+        ({"image": b"x" * 11}, {"image": ["File is larger than 10 bytes."]}),
+        (
+            {"content_type": "text/plain"},
+            {"image": ["Unsupported content type: text/plain."]},
+        ),
+        ({"image": None}, {"image": ["Missing data for required field."]}),
+    ],
+)
+async def test_upload_files_error(client, kwargs, message):
+    res = await client.post("/upload", data=make_form(**kwargs))
+    assert res.status == 422
+    assert await res.json() == {"files": message}
+
+
+async def test_upload_form_after_files(client):
+    form = FormData()
+    form.add_field("image", b"12345", filename="cat.png", content_type="image/png")
+    form.add_field("title", "cat")
+    form.add_field("attachment", b"x" * 100, filename="a.txt")
+    form.add_field("tags", "a")
+    res = await client.post("/upload", data=form)
+    assert res.status == 200
+    assert await res.json() == {
+        "form": {"title": "cat", "tags": ["a"]},
+        "sizes": {"image": 5, "attachment": 100},
+    }
+
+    form = FormData()
+    form.add_field("image", b"12345", filename="cat.png", content_type="image/png")
+    form.add_field("tags", "a")
+    res = await client.post("/upload", data=form)
+    assert res.status == 422
+    assert await res.json() == {"form": {"title": ["Missing data for required field."]}}
+
+
+async def test_upload_form_field_size(make_client):
+    client = await make_client({"POST /upload": upload}, max_form_field_size=5)
+    res = await client.post("/upload", data=make_form(title="kitten"))
+    assert res.status == 422
+    assert await res.json() == {"form": {"title": ["Field is larger than 5 bytes."]}}
+
+    form = FormData()
+    form.add_field("image", b"12345", filename="cat.png", content_type="image/png")
+    form.add_field("title", "kitten")
+    res = await client.post("/upload", data=form)
+    assert res.status == 422
+    assert await res.json() == {"form": {"title": ["Field is larger than 5 bytes."]}}
+
+
+async def test_upload_unread_parts(make_client):
+    @form_schema(FormSchema)
+    @files_schema(FilesSchema)
+    async def handler(request):
+        return web.json_response({})
+
+    client = await make_client({"POST /upload": handler})
+    res = await client.post("/upload", data=make_form())
+    assert res.status == 200
+
+    res = await client.post("/upload", data=make_form(image=None))
+    assert res.status == 422
+    assert await res.json() == {
+        "files": {"image": ["Missing data for required field."]}
+    }
+
+    form = FormData()
+    form.add_field("image", b"12345", filename="cat.png", content_type="image/png")
+    form.add_field("tags", "a")
+    res = await client.post("/upload", data=form)
+    assert res.status == 422
+    assert await res.json() == {"form": {"title": ["Missing data for required field."]}}
@@ -0,0 +1,162 @@
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import make_mocked_request
+from marshmallow import EXCLUDE, Schema, ValidationError, fields
+from multidict import CIMultiDict
+from webargs.aiohttpparser import AIOHTTPParser
+from webargs.core import _UNKNOWN_DEFAULT_PARAM
+
+from aiohttp_apispec import NativeParser, querystring_schema, setup_aiohttp_apispec
+
+
+class QuerySchema(Schema):
+    id = fields.Int()
+    tags = fields.List(fields.Str(), data_key="tag")
+
+
+class HeadersSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE
+
+    request_id = fields.Str(data_key="X-Request-ID", required=True)
+
+
+class CookiesSchema(Schema):
+    session = fields.Str()
+
+
+class MatchInfoSchema(Schema):
+    id = fields.Int()
+
+
+def mocked_request(path="/", headers=None, match_info=None):
+    request = make_mocked_request("GET", path, headers=headers)
+    request._match_info = web.UrlMappingMatchInfo(match_info or {}, None)
+    return request
+
+
+@pytest.fixture(params=[NativeParser, AIOHTTPParser])
+def parser(request):
+    def error_handler(error, req, schema, *, error_status_code, error_headers):
+        raise ValidationError(error.messages)
+
+    return request.param(error_handler=error_handler)
+
+
+@pytest.mark.parametrize(
+    "schema, location, request_kwargs, expected",
+    [
+        (
+            QuerySchema(),
+            "querystring",
+            {"path": "/?id=1&tag=a&tag=b"},
+            {"id": 1, "tags": ["a", "b"]},
+        ),
+        (
+            HeadersSchema(),
+            "headers",
+            {"headers": {"x-request-id": "abc", "X-Other": "1"}},
+            {"request_id": "abc"},
+        ),
+        (
+            CookiesSchema(),
+            "cookies",
+            {"headers": {"Cookie": "session=s1"}},
+            {"session": "s1"},
+        ),
+        (MatchInfoSchema(), "match_info", {"match_info": {"id": "7"}}, {"id": 7}),
+    ],
+)
+async def test_parse(parser, schema, location, request_kwargs, expected):
+    request = mocked_request(**request_kwargs)
+    data = await parser.parse(schema, request, location=location, unknown=None)
+    assert data == expected
+
+
+async def test_parse_error(parser):
+    request = mocked_request("/?id=x&unknown=1")
+    with pytest.raises(ValidationError) as exc:
+        await parser.parse(QuerySchema(), request, location="querystring", unknown=None)
+    assert exc.value.messages == {
+        "querystring": {"id": ["Not a valid integer."], "unknown": ["Unknown field."]}
+    }
+
+
+async def test_parse_caches_plan():
+    parser = NativeParser()
+    schema = MatchInfoSchema()
+    for _ in range(3):
+        request = mocked_request(match_info={"id": "1"})
+        await parser.parse(schema, request, location="match_info")
+    assert len(parser._plans) == 1
+
+
+class SearchSchema(Schema):
+    q = fields.Str()
+    ids = fields.List(fields.Int(), metadata={"explode": False})
+    tags = fields.List(fields.Str(), data_key="tag")
+
+
+async def test_parse_query_lists():
+    request = mocked_request("/?q=a&q=b&ids=1,2&ids=3&tag=x,y&tag=z")
+    data = await NativeParser().parse(SearchSchema(), request, location="querystring")
+    assert data == {"q": "a", "ids": [1, 2, 3], "tags": ["x,y", "z"]}
+
+
+@pytest.mark.parametrize(
+    "version, expected",
+    [("2.0", {"collectionFormat": "csv"}), ("3.0.3", {"explode": False})],
+)
+def test_query_delimited_documentation(version, expected):
+    @querystring_schema(SearchSchema)
+    async def handler(request):
+        return web.Response()
+
+    def get_parameters(native_parser):
+        app = web.Application()
+        app.router.add_get("/search", handler)
+        spec = setup_aiohttp_apispec(
+            app, in_place=True, openapi_version=version, native_parser=native_parser
+        )
+        return {
+            p["name"]: p
+            for p in spec.swagger_dict()["paths"]["/search"]["get"]["parameters"]
+        }
+
+    parameters = get_parameters(native_parser=True)
+    assert expected.items() <= parameters["ids"].items()
+    assert "explode" not in parameters["tag"] or parameters["tag"]["explode"]
+    # webargs parser does not split comma separated values
+    parameters = get_parameters(native_parser=False)
+    assert not expected.items() & parameters["ids"].items()
+
+
+class ForwardedHeadersSchema(Schema):
+    class Meta:
+        unknown = EXCLUDE
+
+    forwarded_for = fields.List(fields.Str(), data_key="X-Forwarded-For")
+    request_id = fields.Str(data_key="X-Request-ID")
+
+
+async def test_parse_headers_declared_keys():
+    headers = CIMultiDict(
+        [
+            ("x-forwarded-for", "a"),
+            ("X-FORWARDED-FOR", "b"),
+            ("X-Request-Id", "abc"),
+            ("X-Trace", "1"),
+        ]
+    )
+    request = mocked_request(headers=headers)
+    schema = ForwardedHeadersSchema()
+    parser = NativeParser()
+
+    data = await parser.parse(schema, request, location="headers")
+    assert data == {"forwarded_for": ["a", "b"], "request_id": "abc"}
+
+    loader, _, _ = parser._plans[(schema, "headers", _UNKNOWN_DEFAULT_PARAM)]
+    assert loader(request, schema) == {
+        "X-Forwarded-For": ["a", "b"],
+        "X-Request-ID": "abc",
+    }
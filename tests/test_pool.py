@@ -0,0 +1,46 @@
+from marshmallow import Schema, fields
+
+from aiohttp_apispec.pool import SchemaPool
+
+
+class ChildSchema(Schema):
+    value = fields.Function(deserialize=lambda value, context: context["value"])
+
+
+class ParentSchema(Schema):
+    value = fields.Function(deserialize=lambda value, context: context["value"])
+    child = fields.Nested(ChildSchema)
+    children = fields.List(fields.Nested(ChildSchema(only=("value",))))
+
+
+def test_pool_isolates_context():
+    schema = ParentSchema(only=("value", "child", "children"))
+    pool = SchemaPool(schema)
+    first = pool.acquire({"value": 1})
+    second = pool.acquire({"value": 2})
+    data = {"value": 0, "child": {"value": 0}, "children": [{"value": 0}]}
+
+    assert first.load(data) == {
+        "value": 1,
+        "child": {"value": 1},
+        "children": [{"value": 1}],
+    }
+    assert second.load(data) == {
+        "value": 2,
+        "child": {"value": 2},
+        "children": [{"value": 2}],
+    }
+    assert first.only == schema.only
+    assert schema.context == {}
+    assert schema.fields["value"].parent is schema
+
+
+def test_pool_reuses_instances():
+    pool = SchemaPool(ParentSchema(), maxsize=1)
+    with pool.use({"value": 1}) as first:
+        with pool.use() as second:
+            assert first is not second
+    assert first.context == {}
+    # only one idle instance is kept
+    assert pool.acquire() is second
+    assert pool.acquire() is not first
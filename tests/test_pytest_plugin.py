@@ -0,0 +1,84 @@
+import pytest
+
+PLUGIN = "aiohttp_apispec.pytest_plugin"
+
+APP = """
+from aiohttp import web
+from marshmallow import Schema, fields
+
+from aiohttp_apispec import request_schema, setup_aiohttp_apispec
+
+
+class ItemSchema(Schema):
+    id = fields.Int()
+    {extra}
+
+
+def make_app():
+    @request_schema(ItemSchema)
+    async def handler(request):
+        return web.json_response({{}})
+
+    app = web.Application()
+    app.router.add_post("/items", handler)
+    return app
+"""
+
+
+@pytest.fixture
+def spec_test(pytester):
+    def make(extra=""):
+        pytester.makepyfile(
+            app=APP.format(extra=extra),
+            test_spec="""
+            from aiohttp_apispec import setup_aiohttp_apispec
+            from app import make_app
+
+
+            def test_spec(apispec_snapshot, apispec_budget):
+                app = make_app()
+                with apispec_budget(seconds=10, memory=50 * 2**20) as budget:
+                    spec = setup_aiohttp_apispec(app, in_place=True)
+                assert budget.elapsed > 0 and budget.peak > 0
+                apispec_snapshot(spec)
+            """,
+        )
+
+    return make
+
+
+def test_snapshot(pytester, spec_test):
+    spec_test()
+    result = pytester.runpytest("-p", PLUGIN)
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*--apispec-snapshot-update*"])
+
+    result = pytester.runpytest("-p", PLUGIN, "--apispec-snapshot-update")
+    result.assert_outcomes(passed=1)
+    assert (pytester.path / "__snapshots__" / "test_spec" / "test_spec.json").exists()
+    result = pytester.runpytest("-p", PLUGIN)
+    result.assert_outcomes(passed=1)
+
+    spec_test(extra="name = fields.Str()")
+    result = pytester.runpytest("-p", PLUGIN)
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*Spec does not match snapshot*"])
+
+
+def test_budget(pytester):
+    pytester.makepyfile("""
+        import pytest
+
+        from aiohttp_apispec.pytest_plugin import SpecBudgetExceeded
+
+
+        def test_budget(apispec_budget):
+            with pytest.raises(SpecBudgetExceeded, match="allocated"):
+                with apispec_budget(memory=1024):
+                    data = [object() for _ in range(10000)]
+            with pytest.raises(SpecBudgetExceeded, match="took"):
+                with apispec_budget(seconds=0):
+                    pass
+        """)
+    result = pytester.runpytest("-p", PLUGIN)
+    result.assert_outcomes(passed=1)
@@ -0,0 +1,75 @@
+import pytest
+from aiohttp import web
+
+from aiohttp_apispec import docs, setup_aiohttp_apispec
+from aiohttp_apispec.utils import get_route_path
+
+
+async def handler(request):
+    return web.Response()
+
+
+def test_route_path_plain():
+    app = web.Application()
+    route = app.router.add_get("/v1/plain", handler)
+    route_path = get_route_path(route)
+    assert route_path.template == "/v1/plain"
+    assert route_path.keys == ()
+    assert route_path.patterns == {}
+
+
+def test_route_path_with_patterns():
+    app = web.Application()
+    route = app.router.add_get(r"/v1/{id:\d+}/{name}/x{code:[a-z]{2}(?:-\d)?}", handler)
+    route_path = get_route_path(route)
+    assert route_path.template == "/v1/{id}/{name}/x{code}"
+    assert route_path.keys == ("id", "name", "code")
+    assert route_path.patterns == {
+        "id": r"^(?:\d+)$",
+        "code": r"^(?:[a-z]{2}(?:-\d)?)$",
+    }
+
+
+def test_route_path_is_cached():
+    app = web.Application()
+    get_route = app.router.add_get("/v1/{id}", handler)
+    post_route = app.router.add_post("/v1/{id}", handler)
+    assert get_route_path(get_route) is get_route_path(post_route)
+
+
+def test_route_path_static():
+    app = web.Application()
+    app.router.add_static("/static", ".")
+    assert get_route_path(next(iter(app.router.routes()))) is None
+
+
+@pytest.mark.parametrize(
+    "openapi_version, id_parameter, slug_parameter",
+    [
+        (
+            "2.0",
+            {"type": "string", "pattern": r"^(?:\d+)$"},
+            {"type": "string"},
+        ),
+        (
+            "3.0.0",
+            {"schema": {"type": "string", "pattern": r"^(?:\d+)$"}},
+            {"schema": {"type": "string"}},
+        ),
+    ],
+)
+def test_path_parameters_with_pattern(openapi_version, id_parameter, slug_parameter):
+    @docs(summary="Get item")
+    async def item(request):
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_get(r"/v1/items/{id:\d+}/{slug}", item)
+    apispec = setup_aiohttp_apispec(app, in_place=True, openapi_version=openapi_version)
+    parameters = apispec.swagger_dict()["paths"]["/v1/items/{id}/{slug}"]["get"][
+        "parameters"
+    ]
+    assert parameters == [
+        dict(id_parameter, **{"in": "path", "name": "id", "required": True}),
+        dict(slug_parameter, **{"in": "path", "name": "slug", "required": True}),
+    ]
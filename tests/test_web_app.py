@@ -1,3 +1,26 @@
+import asyncio
+
+import pytest
+from aiohttp import web
+from marshmallow import Schema, ValidationError, fields, pre_load
+from webargs.aiohttpparser import parser
+
+from aiohttp_apispec import (
+    ValidationErrorResponse,
+    ValidationPolicy,
+    async_validates,
+    async_validates_schema,
+    docs,
+    match_info_schema,
+    querystring_schema,
+    request_schema,
+    setup_aiohttp_apispec,
+    ws_message_schema,
+    ws_messages,
+)
+from aiohttp_apispec.async_validation import get_async_validators, run_async_validators
+
+
 async def test_response_200_get(aiohttp_app):
     res = await aiohttp_app.get("/v1/test", params={"id": 1, "name": "max"})
     assert res.status == 200
@@ -190,3 +213,554 @@ async def test_swagger_static(aiohttp_app):
     assert (await aiohttp_app.get("/static/swagger/swagger-ui.css")).status == 200 or (
         await aiohttp_app.get("/v1/static/swagger/swagger-ui.css")
     ).status == 200
+
+
+async def test_data_class(make_client):
+    class Item:
+        def __init__(self, id, name):
+            self.id = id
+            self.name = name
+
+    class ItemSchema(Schema):
+        id = fields.Int()
+        name = fields.Str(data_key="title")
+
+    @request_schema(ItemSchema, data_class=True)
+    async def slots_handler(request):
+        data = request["data"]
+        assert not hasattr(data, "__dict__")
+        return web.json_response({"id": data.id, "name": data.name})
+
+    @request_schema(ItemSchema(many=True), data_class=Item)
+    async def class_handler(request):
+        return web.json_response([item.name for item in request["data"]])
+
+    client = await make_client(
+        {"POST /slots": slots_handler, "POST /class": class_handler}
+    )
+
+    res = await client.post("/slots", json={"title": "max"})
+    assert await res.json() == {"id": None, "name": "max"}
+    res = await client.post(
+        "/class", json=[{"id": 1, "title": "a"}, {"id": 2, "title": "b"}]
+    )
+    assert await res.json() == ["a", "b"]
+
+
+async def test_error_response(make_client):
+    class ItemSchema(Schema):
+        id = fields.Int()
+
+    @request_schema(ItemSchema)
+    async def handler(request):
+        return web.json_response(request["data"])
+
+    @web.middleware
+    async def outer(request, handler):
+        response = await handler(request)
+        response.headers["X-Outer"] = "1"
+        return response
+
+    client = await make_client(
+        {"POST /items": handler},
+        middlewares=[outer],
+        error_response=ValidationErrorResponse(status=400, headers={"X-A": "b"}),
+    )
+
+    res = await client.post("/items", json={"id": "x"})
+    assert res.status == 400
+    assert res.headers["X-A"] == "b"
+    # response is returned by validation_middleware, not raised
+    assert res.headers["X-Outer"] == "1"
+    assert await res.json() == {"json": {"id": ["Not a valid integer."]}}
+
+    res = await client.post("/items", json={"id": 1})
+    assert await res.json() == {"id": 1}
+
+
+def test_error_callback_does_not_change_webargs_parser():
+    def error_callback(*args, **kwargs):
+        raise web.HTTPBadRequest()
+
+    app = web.Application()
+    setup_aiohttp_apispec(app, error_callback=error_callback)
+    assert parser.error_callback is None
+    assert app["_apispec_parser"] is not parser
+    assert app["_apispec_parser"].error_callback is error_callback
+
+
+async def test_isolated_context(make_client):
+    class UserSchema(Schema):
+        name = fields.Str()
+        user = fields.Str()
+
+        @pre_load
+        def add_user(self, data, **kwargs):
+            return dict(data, user=self.context["request"].headers["X-User"])
+
+    @request_schema(UserSchema, isolated_context=True)
+    async def handler(request):
+        return web.json_response(request["data"])
+
+    client = await make_client({"POST /users": handler})
+
+    responses = await asyncio.gather(
+        *(
+            client.post("/users", json={"name": str(i)}, headers={"X-User": str(i)})
+            for i in range(10)
+        )
+    )
+    for i, res in enumerate(responses):
+        assert await res.json() == {"name": str(i), "user": str(i)}
+    assert handler.__schemas__[0].schema.context == {}
+
+
+async def test_validate_docs(make_client):
+    @docs(
+        parameters=[
+            {"in": "query", "name": "limit", "type": "integer", "maximum": 100},
+            {
+                "in": "query",
+                "name": "tags",
+                "type": "array",
+                "items": {"type": "string", "enum": ["a", "b"]},
+                "collectionFormat": "csv",
+            },
+            {
+                "in": "header",
+                "name": "X-Request-ID",
+                "type": "string",
+                "format": "uuid",
+                "required": "true",
+            },
+            {
+                "in": "body",
+                "name": "body",
+                "required": True,
+                "schema": {
+                    "type": "object",
+                    "required": ["name"],
+                    "properties": {"name": {"type": "string", "minLength": 1}},
+                },
+            },
+        ]
+    )
+    async def handler(request):
+        return web.json_response(request["data"])
+
+    client = await make_client(
+        {"POST /items": handler}, validate_docs=True, error_response=True
+    )
+    headers = {"X-Request-ID": "9f2c3a5e-7c1b-4d3e-8f4a-2b6c1d0e9a7f"}
+
+    res = await client.post(
+        "/items?limit=10&tags=a,b", json={"name": "x", "extra": 1}, headers=headers
+    )
+    assert res.status == 200
+    assert await res.json() == {
+        "limit": 10,
+        "tags": ["a", "b"],
+        "X-Request-ID": headers["X-Request-ID"],
+        "name": "x",
+        "extra": 1,
+    }
+
+    res = await client.post("/items?limit=x&tags=c", json={}, headers=headers)
+    assert res.status == 422
+    assert await res.json() == {
+        "querystring": {
+            "limit": ["Not a valid integer."],
+            "tags": {"0": ["Must be one of: a, b."]},
+        }
+    }
+
+    res = await client.post("/items", json={"name": ""})
+    assert await res.json() == {
+        "headers": {"X-Request-ID": ["Missing data for required field."]}
+    }
+
+    res = await client.post("/items?limit=101", json={"name": ""}, headers=headers)
+    assert await res.json() == {
+        "querystring": {"limit": ["Must be less than or equal to 100."]}
+    }
+
+    res = await client.post("/items", json={"name": ""}, headers=headers)
+    assert await res.json() == {"json": {"name": ["Shorter than minimum length 1."]}}
+    assert list(client.app["_apispec_docs_validators"]) == [handler]
+
+
+async def test_validate_docs_openapi_3(make_client):
+    @docs(
+        parameters=[
+            {"in": "path", "name": "id", "schema": {"type": "integer", "minimum": 1}},
+            {"in": "query", "name": "flag", "schema": {"type": "boolean"}},
+        ],
+        requestBody={
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"note": {"type": "string", "nullable": True}},
+                        "additionalProperties": False,
+                    }
+                }
+            },
+        },
+    )
+    async def handler(request):
+        return web.json_response(request["data"])
+
+    client = await make_client(
+        {"PUT /items/{id}": handler},
+        validate_docs=True,
+        error_response=True,
+        openapi_version="3.0.0",
+    )
+
+    res = await client.put("/items/1?flag=true", json={"note": None})
+    assert await res.json() == {"id": 1, "flag": True, "note": None}
+
+    res = await client.put("/items/0", json={"other": 1})
+    assert await res.json() == {
+        "match_info": {"id": ["Must be greater than or equal to 1."]}
+    }
+
+    res = await client.put("/items/1")
+    assert await res.json() == {"json": ["Missing data for required field."]}
+
+    res = await client.put("/items/1", json={"other": 1})
+    assert await res.json() == {"json": {"other": ["Unknown field."]}}
+
+    for body in (b"{", b"\xff"):
+        res = await client.put(
+            "/items/1", data=body, headers={"Content-Type": "application/json"}
+        )
+        assert res.status == 422
+        assert await res.json() == {"json": ["Invalid JSON body."]}
+
+
+async def test_validate_docs_marshmallow_body(make_client):
+    class PetSchema(Schema):
+        name = fields.Str(required=True)
+
+    @docs(
+        parameters=[
+            {"in": "query", "name": "age", "minimum": 1},
+            {"in": "body", "name": "body", "schema": PetSchema},
+        ]
+    )
+    async def handler(request):
+        return web.json_response(request["data"])
+
+    client = await make_client(
+        {"POST /pets": handler}, validate_docs=True, error_response=True
+    )
+
+    res = await client.post("/pets?age=2", json={"name": "Rex"})
+    assert res.status == 200
+    assert await res.json() == {"age": "2", "name": "Rex"}
+
+    res = await client.post("/pets", json={})
+    assert res.status == 422
+    assert await res.json() == {"json": {"name": ["Missing data for required field."]}}
+
+    res = await client.post("/pets?age=x", json={"name": "Rex"})
+    assert res.status == 422
+    assert await res.json() == {"querystring": {"age": ["Not a valid number."]}}
+
+    res = await client.post("/pets?age=0", json={"name": "Rex"})
+    assert await res.json() == {
+        "querystring": {"age": ["Must be greater than or equal to 1."]}
+    }
+
+
+async def test_validation_cache(make_client):
+    loads = []
+
+    class QuerySchema(Schema):
+        page = fields.Int(load_default=1)
+        ids = fields.List(fields.Int())
+
+        @pre_load
+        def count(self, data, **kwargs):
+            loads.append("query")
+            return data
+
+    class PathSchema(Schema):
+        id = fields.Int()
+
+        @pre_load
+        def count(self, data, **kwargs):
+            loads.append("path")
+            return data
+
+    @match_info_schema(PathSchema)
+    @querystring_schema(QuerySchema)
+    async def handler(request):
+        data = request["querystring"]
+        data["changed"] = True
+        data.get("ids", []).append(99)
+        return web.json_response(dict(data, **request["match_info"]))
+
+    client = await make_client({"GET /items/{id}": handler}, validation_cache_size=2)
+    cache = client.app["_apispec_validation_cache"]
+
+    for _ in range(3):
+        res = await client.get("/items/1?page=2&ids=1&ids=2")
+        assert await res.json() == {
+            "page": 2,
+            "ids": [1, 2, 99],
+            "id": 1,
+            "changed": True,
+        }
+    assert loads == ["query", "path"]
+    assert cache.stats() == {
+        "hits": 4,
+        "misses": 2,
+        "hit_rate": 4 / 6,
+        "size": 2,
+        "maxsize": 2,
+    }
+
+    res = await client.get("/items/1?page=x")
+    assert res.status == 422
+    res = await client.get("/items/1?page=x")
+    assert res.status == 422
+    assert loads.count("query") == 3
+    # least recently used results are evicted
+    await client.get("/items/2?page=2&ids=1&ids=2")
+    assert len(cache) == 2
+    assert loads == ["query", "path", "query", "query", "path"]
+    await client.get("/items/1?page=2&ids=1&ids=2")
+    assert loads == ["query", "path", "query", "query", "path", "path"]
+
+
+async def test_ws_messages(make_client):
+    class PingSchema(Schema):
+        type = fields.Str(required=True)
+
+    class MoveSchema(Schema):
+        type = fields.Str(required=True)
+        x = fields.Int(required=True)
+
+    class GameView(web.View):
+        @ws_message_schema(
+            {"ping": PingSchema, "move": MoveSchema}, discriminator="type"
+        )
+        async def get(self):
+            ws = web.WebSocketResponse()
+            await ws.prepare(self.request)
+            async for message in ws_messages(self.request, ws):
+                await ws.send_json(message)
+            return ws
+
+    client = await make_client({"GET /game": GameView})
+
+    async with client.ws_connect("/game") as ws:
+        await ws.send_str('{"type": "move", "x": "1"}')
+        assert await ws.receive_json() == {"type": "move", "x": 1}
+        # batch frame is validated as a whole
+        await ws.send_json([{"type": "ping"}, {"type": "move", "x": 2}])
+        assert await ws.receive_json() == {"type": "ping"}
+        assert await ws.receive_json() == {"type": "move", "x": 2}
+        await ws.send_json([{"type": "ping"}, {"type": "jump"}, {"type": "move"}])
+        assert await ws.receive_json() == {
+            "errors": {
+                "1": {"type": ["Must be one of: ping, move."]},
+                "2": {"x": ["Missing data for required field."]},
+            }
+        }
+        await ws.send_str("{")
+        assert await ws.receive_json() == {"errors": ["Invalid JSON message."]}
+
+
+async def test_request_schema_discriminator(make_client):
+    class CatSchema(Schema):
+        kind = fields.Str(required=True)
+        lives = fields.Int(required=True)
+
+    class DogSchema(Schema):
+        kind = fields.Str(required=True)
+        breed = fields.Str(required=True)
+
+    @request_schema({"cat": CatSchema, "dog": DogSchema}, discriminator="kind")
+    async def handler(request):
+        return web.json_response(request["data"])
+
+    client = await make_client({"POST /pets": handler}, error_response=True)
+
+    res = await client.post("/pets", json={"kind": "cat", "lives": "9"})
+    assert await res.json() == {"kind": "cat", "lives": 9}
+    res = await client.post("/pets", json={"kind": "dog", "lives": 9})
+    assert await res.json() == {
+        "json": {
+            "breed": ["Missing data for required field."],
+            "lives": ["Unknown field."],
+        }
+    }
+    res = await client.post("/pets", json={"kind": "cow"})
+    assert await res.json() == {"json": {"kind": ["Must be one of: cat, dog."]}}
+
+
+async def test_request_schema_discriminator_async_validators(make_client):
+    class CatSchema(Schema):
+        type = fields.Str(required=True)
+
+    class DogSchema(Schema):
+        kind = fields.Str(data_key="type", required=True)
+        breed = fields.Str(required=True)
+
+        @async_validates("breed")
+        async def check_breed(self, value, request):
+            raise ValidationError("Unknown breed.")
+
+    @request_schema({"cat": CatSchema, "dog": DogSchema}, discriminator="type")
+    async def handler(request):
+        return web.json_response(request["data"])
+
+    client = await make_client({"POST /pets": handler}, error_response=True)
+
+    res = await client.post("/pets", json={"type": "dog", "breed": "x"})
+    assert res.status == 422
+    assert await res.json() == {"json": {"breed": ["Unknown breed."]}}
+
+    class MouseSchema(DogSchema):
+        # discriminator is not loaded, so variant can not be told
+        class Meta:
+            exclude = ("kind",)
+
+    with pytest.raises(ValueError, match="MouseSchema"):
+        request_schema({"mouse": MouseSchema}, discriminator="type")
+
+
+async def test_validation_policy(make_client):
+    class QuerySchema(Schema):
+        ids = fields.List(fields.Int(), data_key="id")
+        page = fields.Int(load_default=1)
+
+    class BodySchema(Schema):
+        name = fields.Str(required=True)
+
+    @querystring_schema(QuerySchema)
+    @request_schema(BodySchema)
+    async def handler(request):
+        return web.json_response(
+            {"query": request["querystring"], "body": request["data"]}
+        )
+
+    policy = ValidationPolicy(
+        lambda request: "X-Internal" in request.headers, sample_rate=0.5
+    )
+    client = await make_client(
+        {"POST /items": handler}, validation_policy=policy, error_response=True
+    )
+
+    res = await client.post("/items?id=1&id=2", json={})
+    assert res.status == 422
+
+    internal = {"X-Internal": "1"}
+    res = await client.post("/items?id=1&id=2", json={"other": 1}, headers=internal)
+    assert await res.json() == {"query": {"ids": ["1", "2"]}, "body": []}
+    # every second trusted request is validated
+    res = await client.post("/items?id=1&id=2", json={}, headers=internal)
+    assert res.status == 422
+    res = await client.post("/items?id=x", json={"name": "a"}, headers=internal)
+    assert await res.json() == {"query": {"ids": ["x"]}, "body": {"name": "a"}}
+    assert policy.skipped == 2
+
+
+def test_validation_policy_sample_rate():
+    with pytest.raises(ValueError):
+        ValidationPolicy(lambda request: True, sample_rate=2)
+
+
+async def test_async_validators(make_client):
+    lookups = []
+    products = {1: 5, 2: 0}
+
+    class OrderSchema(Schema):
+        product_id = fields.Int(data_key="productId", required=True)
+        quantity = fields.Int(required=True)
+        coupon = fields.Str()
+
+        @async_validates("product_id", batch=True)
+        async def check_products(self, values, request):
+            lookups.append(values)
+            await asyncio.sleep(0)
+            return {
+                i: "Unknown product." for i, v in enumerate(values) if v not in products
+            }
+
+        @async_validates("coupon")
+        async def check_coupon(self, value, request):
+            await asyncio.sleep(0)
+            if value != request.headers.get("X-Coupon"):
+                raise ValidationError("Invalid coupon.")
+
+        @async_validates_schema()
+        async def check_stock(self, data, request):
+            if products.get(data["product_id"], 1) < data["quantity"]:
+                raise ValidationError("Out of stock.")
+
+    @request_schema(OrderSchema(many=True))
+    async def handler(request):
+        return web.json_response(request["data"])
+
+    client = await make_client({"POST /orders": handler}, error_response=True)
+
+    orders = [
+        {"productId": 1, "quantity": 1, "coupon": "a"},
+        {"productId": 1, "quantity": 2},
+    ]
+    res = await client.post("/orders", json=orders, headers={"X-Coupon": "a"})
+    assert await res.json() == [
+        {"product_id": 1, "quantity": 1, "coupon": "a"},
+        {"product_id": 1, "quantity": 2},
+    ]
+    # one batched lookup for all items
+    assert lookups == [[1, 1]]
+
+    orders = [
+        {"productId": 3, "quantity": 1},
+        {"productId": 2, "quantity": 1, "coupon": "b"},
+        {"productId": 1, "quantity": 1},
+    ]
+    res = await client.post("/orders", json=orders, headers={"X-Coupon": "a"})
+    assert res.status == 422
+    assert await res.json() == {
+        "json": {
+            "0": {"productId": ["Unknown product."]},
+            "1": {"coupon": ["Invalid coupon."], "_schema": ["Out of stock."]},
+        }
+    }
+
+
+async def test_async_validators_misuse():
+    class OrderSchema(Schema):
+        product_id = fields.Int()
+        coupon = fields.Str()
+
+        @async_validates("product_id", batch=True)
+        async def check_products(self, values, request):
+            return {len(values): "Unknown product."}
+
+        @async_validates("coupon")
+        async def check_coupon(self, value, request):
+            raise ValidationError("Invalid coupon.")
+
+    # validators of excluded fields are skipped
+    schema = OrderSchema(only=("product_id",))
+    assert [attr for attr, *_ in get_async_validators(schema)] == ["check_products"]
+    with pytest.raises(ValueError, match="check_products returned position 1"):
+        await run_async_validators(schema, {"product_id": 1}, None)
+
+    class TypoSchema(Schema):
+        product_id = fields.Int()
+
+        @async_validates("product")
+        async def check_product(self, value, request):
+            pass
+
+    with pytest.raises(ValueError, match='"product" field'):
+        request_schema(TypoSchema)